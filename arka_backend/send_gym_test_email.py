@@ -1,28 +1,64 @@
 #!/usr/bin/env python
 """
-Send real test email for gym website request
+Send a test email for a gym website request
+The admin notification and client confirmation are queued in a throwaway test
+database and delivered (claim_outbox_emails + deliver_outbox_email) to an
+in-process SMTP sink, so nothing reaches a real mailbox.
+This copy of the project has no outbox or SMTP sink, so the script runs against
+the project at the repository root.
+Run with: python send_gym_test_email.py
 """
 
 import os
+import sys
 import django
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arka_backend.settings')
 django.setup()
 
-from projects.services import send_website_request_email, send_website_request_confirmation
+from django.db import connection
+from django.test import override_settings
+from projects.services import (
+    claim_outbox_emails, deliver_outbox_email, send_website_request_email, send_website_request_confirmation,
+)
+from projects.smtp_pool import reset_pool
+from projects.smtp_sink import SMTPSinkServer
+
+CLIENT_EMAIL = 'gym-owner@example.com'
+ADMIN_EMAIL = 'admin@example.com'
+
+sink = SMTPSinkServer()
+sink.start()
+email_settings = override_settings(
+    EMAIL_BACKEND='projects.mail.InstrumentedSMTPBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_PORT=sink.port,
+    EMAIL_USE_TLS=False,
+    EMAIL_USE_SSL=False,
+    EMAIL_HOST_USER='test',
+    EMAIL_HOST_PASSWORD='test',
+    DEFAULT_FROM_EMAIL='noreply@example.com',
+    ADMIN_EMAIL=ADMIN_EMAIL,
+    ADMIN_EMAIL_DIGEST_ENABLED=False,
+    EMAIL_DISPATCH_MODE='worker',  # delivered below, not by a background dispatcher
+)
+email_settings.enable()
+reset_pool()
+old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
 
 print("=" * 70)
-print("SENDING TEST EMAIL TO: rajumang74@gmail.com")
+print(f"SENDING TEST EMAIL TO: {ADMIN_EMAIL} (SMTP sink on 127.0.0.1:{sink.port})")
 print("=" * 70)
 
 try:
-    # Send email to admin
+    # Queue the email to admin
     result = send_website_request_email(
         business_name="FitZone Gym",
-        email="umangraj032@gmail.com",
+        email=CLIENT_EMAIL,
         website_type="Business Website",
         description="""
-We are a premium fitness gym in the city center with state-of-the-art equipment. 
+We are a premium fitness gym in the city center with state-of-the-art equipment.
 
 We need a professional website that:
 - Showcases our gym facilities with photos
@@ -39,21 +75,28 @@ We have 200+ members and want to attract more through the website.
         is_logged_in=False,
         user_info=None
     )
-    
-    print(f"\n✓ Admin email sent successfully: {result}")
-    
-    # Send confirmation to customer
-    result = send_website_request_confirmation("umangraj032@gmail.com", "FitZone Gym")
-    print(f"✓ Confirmation email sent to customer: {result}")
-    
+    print(f"\n✓ Admin email queued: {result}")
+
+    # Queue the confirmation to customer
+    result = send_website_request_confirmation(CLIENT_EMAIL, "FitZone Gym")
+    print(f"✓ Confirmation email queued for customer: {result}")
+
+    # Deliver both the way the email worker does
+    for outbox_email in claim_outbox_emails():
+        if deliver_outbox_email(outbox_email):
+            print(f"✓ Sent to {', '.join(outbox_email.recipients)}: {outbox_email.subject}")
+        else:
+            print(f"✗ Failed for {', '.join(outbox_email.recipients)}: {outbox_email.last_error}")
+
     print("\n" + "=" * 70)
     print("TEST COMPLETE!")
     print("=" * 70)
-    print("\nCheck rajumang74@gmail.com inbox for the gym website request")
-    print("Check umangraj032@gmail.com inbox for the confirmation email")
-    
+    print(f"\nThe sink accepted {sink.stats['messages']} message(s)")
+
 except Exception as e:
     print(f"\n✗ Error: {str(e)}")
-    print(f"\nNote: If you see 'Connection refused', SMTP is not configured.")
-    print(f"To send real emails, add Gmail credentials to .env:")
-    print(f"  EMAIL_HOST_PASSWORD=your-app-password")
+finally:
+    reset_pool()
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+    email_settings.disable()
+    sink.stop()
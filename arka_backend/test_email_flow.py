@@ -1,18 +1,32 @@
 #!/usr/bin/env python
 """
 Comprehensive email flow test script for Arka
-Tests the complete website request submission flow with specific test emails
+Tests the complete website request submission flow: the emails are queued in a
+throwaway test database, then delivered the way the email worker does
+(claim_outbox_emails + deliver_outbox_email) to an in-process SMTP sink, so
+nothing reaches a real mailbox.
+This copy of the project has no outbox or SMTP sink, so the script runs against
+the project at the repository root.
 Run with: python test_email_flow.py
 """
 
 import os
+import sys
 import django
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arka_backend.settings')
 django.setup()
 
-from projects.services import send_contact_form_email, send_website_request_email, send_website_request_confirmation
+from projects.services import (
+    claim_outbox_emails, deliver_outbox_email, send_contact_form_email, send_website_request_email,
+    send_website_request_confirmation,
+)
+from projects.smtp_pool import reset_pool
+from projects.smtp_sink import SMTPSinkServer
 from django.conf import settings
+from django.db import connection
+from django.test import override_settings
 import logging
 
 # Configure logging to see all messages
@@ -22,86 +36,118 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-print("=" * 80)
-print("ARKA - COMPREHENSIVE EMAIL FLOW TEST")
-print("=" * 80)
-print(f"\nEmail Configuration:")
-print(f"  DEBUG Mode: {settings.DEBUG}")
-print(f"  EMAIL_BACKEND: {settings.EMAIL_BACKEND}")
-print(f"  EMAIL_HOST: {settings.EMAIL_HOST}")
-print(f"  EMAIL_PORT: {settings.EMAIL_PORT}")
-print(f"  DEFAULT_FROM_EMAIL: {settings.DEFAULT_FROM_EMAIL}")
-print(f"  ADMIN_EMAIL: {settings.ADMIN_EMAIL}")
+CLIENT_EMAIL = 'client@example.com'
+ADMIN_EMAIL = 'admin@example.com'
 
-print("\n" + "=" * 80)
-print("TEST 1: CONTACT FORM EMAIL (Admin Notification)")
-print("=" * 80)
-try:
-    result = send_contact_form_email(
-        name="Test User",
-        email="umangraj032@gmail.com",
-        message="This is a test contact message from the website contact form."
-    )
-    status = "✓ SUCCESS" if result else "✗ FAILED"
-    print(f"{status} - Contact form email sent to admin (rajumang74@gmail.com)")
-except Exception as e:
-    print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
+sink = SMTPSinkServer()
+sink.start()
+email_settings = override_settings(
+    EMAIL_BACKEND='projects.mail.InstrumentedSMTPBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_PORT=sink.port,
+    EMAIL_USE_TLS=False,
+    EMAIL_USE_SSL=False,
+    EMAIL_HOST_USER='test',
+    EMAIL_HOST_PASSWORD='test',
+    DEFAULT_FROM_EMAIL='noreply@example.com',
+    ADMIN_EMAIL=ADMIN_EMAIL,
+    ADMIN_EMAIL_DIGEST_ENABLED=False,
+    EMAIL_DISPATCH_MODE='worker',  # delivered below, not by a background dispatcher
+)
+email_settings.enable()
+reset_pool()
+old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
 
-print("\n" + "=" * 80)
-print("TEST 2: WEBSITE REQUEST - ADMIN NOTIFICATION")
-print("=" * 80)
 try:
-    result = send_website_request_email(
-        business_name="Test Business LLC",
-        email="umangraj032@gmail.com",
-        website_type="E-Commerce Store",
-        description="We need a custom e-commerce website to sell our products online. The site should have product catalog, shopping cart, payment integration, and inventory management.",
-        budget="$2000 - $3000",
-        is_logged_in=True,
-        user_info="Umanraj Singh"
-    )
-    status = "✓ SUCCESS" if result else "✗ FAILED"
-    print(f"{status} - Website request email sent to admin (rajumang74@gmail.com)")
-except Exception as e:
-    print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
+    print("=" * 80)
+    print("ARKA - COMPREHENSIVE EMAIL FLOW TEST")
+    print("=" * 80)
+    print(f"\nEmail Configuration:")
+    print(f"  EMAIL_BACKEND: {settings.EMAIL_BACKEND}")
+    print(f"  EMAIL_HOST: {settings.EMAIL_HOST} (in-process SMTP sink)")
+    print(f"  EMAIL_PORT: {settings.EMAIL_PORT}")
+    print(f"  DEFAULT_FROM_EMAIL: {settings.DEFAULT_FROM_EMAIL}")
+    print(f"  ADMIN_EMAIL: {settings.ADMIN_EMAIL}")
 
-print("\n" + "=" * 80)
-print("TEST 3: WEBSITE REQUEST - CLIENT CONFIRMATION")
-print("=" * 80)
-try:
-    result = send_website_request_confirmation(
-        email="umangraj032@gmail.com",
-        business_name="Test Business LLC"
-    )
-    status = "✓ SUCCESS" if result else "✗ FAILED"
-    print(f"{status} - Confirmation email sent to client (umangraj032@gmail.com)")
-except Exception as e:
-    print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
+    print("\n" + "=" * 80)
+    print("TEST 1: CONTACT FORM EMAIL (Admin Notification)")
+    print("=" * 80)
+    try:
+        result = send_contact_form_email(
+            name="Test User",
+            email=CLIENT_EMAIL,
+            message="This is a test contact message from the website contact form."
+        )
+        status = "✓ SUCCESS" if result else "✗ FAILED"
+        print(f"{status} - Contact form email queued for admin ({ADMIN_EMAIL})")
+    except Exception as e:
+        print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
 
-print("\n" + "=" * 80)
-print("SUMMARY")
-print("=" * 80)
-print("""
-The email system has been tested with the following test emails:
-  - Client Email: umangraj032@gmail.com
-  - Admin Email: rajumang74@gmail.com
+    print("\n" + "=" * 80)
+    print("TEST 2: WEBSITE REQUEST - ADMIN NOTIFICATION")
+    print("=" * 80)
+    try:
+        result = send_website_request_email(
+            business_name="Test Business LLC",
+            email=CLIENT_EMAIL,
+            website_type="E-Commerce Store",
+            description="We need a custom e-commerce website to sell our products online. The site should have product catalog, shopping cart, payment integration, and inventory management.",
+            budget="$2000 - $3000",
+            is_logged_in=True,
+            user_info="Test User"
+        )
+        status = "✓ SUCCESS" if result else "✗ FAILED"
+        print(f"{status} - Website request email queued for admin ({ADMIN_EMAIL})")
+    except Exception as e:
+        print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
 
+    print("\n" + "=" * 80)
+    print("TEST 3: WEBSITE REQUEST - CLIENT CONFIRMATION")
+    print("=" * 80)
+    try:
+        result = send_website_request_confirmation(
+            email=CLIENT_EMAIL,
+            business_name="Test Business LLC"
+        )
+        status = "✓ SUCCESS" if result else "✗ FAILED"
+        print(f"{status} - Confirmation email queued for client ({CLIENT_EMAIL})")
+    except Exception as e:
+        print(f"✗ FAILED - Error: {type(e).__name__}: {str(e)}")
+
+    print("\n" + "=" * 80)
+    print("DELIVERY: OUTBOX -> SMTP SINK")
+    print("=" * 80)
+    delivered = {}
+    failed = 0
+    for outbox_email in claim_outbox_emails():
+        if deliver_outbox_email(outbox_email):
+            for recipient in outbox_email.recipients:
+                delivered.setdefault(recipient, []).append(outbox_email.subject)
+            print(f"✓ SENT - {outbox_email.subject} -> {', '.join(outbox_email.recipients)}")
+        else:
+            failed += 1
+            print(f"✗ FAILED - {outbox_email.subject}: {outbox_email.last_error}")
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"""
 Expected Results:
-  1. Admin (rajumang74@gmail.com) should receive:
-     - Contact form submission from umangraj032@gmail.com
+  1. Admin ({ADMIN_EMAIL}) receives:
+     - Contact form submission from {CLIENT_EMAIL}
      - Website request notification with project details
-     
-  2. Client (umangraj032@gmail.com) should receive:
-     - Confirmation email for their website request
 
-Check your Gmail inbox for incoming emails.
-If DEBUG=True, emails appear in the console output above.
-If DEBUG=False, emails are sent via SMTP to rajumang74@gmail.com.
+  2. Client ({CLIENT_EMAIL}) receives:
+     - Confirmation email for their website request
 
-Configuration Details:
-""")
-print(f"  Email Backend: {settings.EMAIL_BACKEND}")
-print(f"  SMTP Host: {settings.EMAIL_HOST}:{settings.EMAIL_PORT}")
-print(f"  TLS Enabled: {settings.EMAIL_USE_TLS}")
-print(f"  From Email: {settings.DEFAULT_FROM_EMAIL}")
-print("\n" + "=" * 80)
+Delivered:""")
+    for recipient, subjects in delivered.items():
+        print(f"  {recipient}: {len(subjects)} email(s)")
+    print(f"  Failed: {failed}")
+    print(f"  Sink stats: {sink.stats}")
+    print("\n" + "=" * 80)
+finally:
+    reset_pool()
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+    email_settings.disable()
+    sink.stop()
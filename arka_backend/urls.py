@@ -16,6 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
+from projects import api as project_api
 from projects import views as project_views
 
 urlpatterns = [
@@ -28,4 +29,9 @@ urlpatterns = [
     path('login/', project_views.login_view, name='login'),
     path('signup/', project_views.signup_view, name='signup'),
     path('logout/', project_views.logout_view, name='logout'),
+    path('metrics/email/', project_views.email_metrics, name='email-metrics'),
+    # JSON API
+    path('api/v1/requests/', project_api.requests_collection, name='api-requests'),
+    path('api/v1/requests/<int:pk>/', project_api.request_detail, name='api-request-detail'),
+    path('api/v1/requests/<int:pk>/status-updates/', project_api.request_status_history, name='api-request-status-updates'),
 ]
@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for Arka
+Picked up automatically by `gunicorn arka_backend.wsgi`
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+
+def post_worker_init(worker):
+    """Start the email dispatcher and its outbox sweeper at boot (EMAIL_DISPATCH_MODE=thread)"""
+    from projects.services import start_dispatcher
+    start_dispatcher()
+
+
+def worker_exit(server, worker):
+    """Send the emails still queued in this worker's dispatcher (EMAIL_DISPATCH_MODE=thread)"""
+    from projects.services import shutdown_dispatcher
+    left = shutdown_dispatcher()
+    if left:
+        server.log.warning(f"Worker {worker.pid} exited with {left} email(s) left in the outbox")
@@ -1,30 +1,63 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.urls import path
 from django.utils.html import format_html
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from .models import WebsiteRequest, StatusUpdate
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from .models import WebsiteRequest, StatusUpdate, EmailOutbox, EmailSendMetric, ArchivedWebsiteRequest, ArchivedStatusUpdate
+from .search import FullTextSearchMixin
+from .routers import ReplicaChangeListMixin
+from .export import EXPORT_FORMATS, export_response
+from .archive import restore_archived_requests
 
 
 @admin.register(StatusUpdate)
-class StatusUpdateAdmin(admin.ModelAdmin):
+class StatusUpdateAdmin(ReplicaChangeListMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['request', 'old_status', 'new_status', 'created_at', 'notified_status']
     list_filter = ['created_at', 'notified']
     search_fields = ['request__business_name', 'admin_message']
-    readonly_fields = ['request', 'old_status', 'new_status', 'created_at']
+    full_text_related = ['request']
+    readonly_fields = ['request', 'old_status', 'new_status', 'created_at', 'notified_at', 'notify_attempts', 'notify_after', 'notify_error']
+    actions = ['retry_notification']
     
     def notified_status(self, obj):
         if obj.notified:
             return format_html('✅ <span style="color: green;">Notified</span>')
-        return format_html('❌ <span style="color: red;">Not Notified</span>')
+        if obj.notify_attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            return format_html('❌ <span style="color: red;" title="{}">Failed</span>', obj.notify_error)
+        if obj.notify_attempts:
+            return format_html('⏳ <span style="color: #B8860B;" title="{}">Retrying (attempt {})</span>', obj.notify_error, obj.notify_attempts)
+        return format_html('⏳ <span style="color: #B8860B;">Queued</span>')
     notified_status.short_description = 'User Notified'
+    
+    def changelist_view(self, request, extra_context=None):
+        """Show the size and age of the notification backlog above the list"""
+        pending = StatusUpdate.objects.filter(notified=False)
+        backlog = pending.aggregate(
+            queued=Count('pk', filter=Q(notify_attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)),
+            failed=Count('pk', filter=Q(notify_attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)),
+            oldest=Min('created_at', filter=Q(notify_attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)),
+        )
+        extra_context = {**(extra_context or {}), 'notification_backlog': backlog}
+        return super().changelist_view(request, extra_context)
+    
+    def retry_notification(self, request, queryset):
+        """Queue the client email again for the selected (unnotified) updates"""
+        updated = queryset.filter(notified=False).update(notify_attempts=0, notify_after=None, notify_error='')
+        self.message_user(request, f"{updated} notification(s) queued for delivery.")
+    retry_notification.short_description = 'Retry client notification'
 
 
 @admin.register(WebsiteRequest)
-class WebsiteRequestAdmin(admin.ModelAdmin):
+class WebsiteRequestAdmin(ReplicaChangeListMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['business_name', 'email', 'website_type', 'status_badge', 'payment_status_display', 'created_at', 'user_info']
     list_filter = ['status', 'website_type', 'created_at']
     search_fields = ['business_name', 'email', 'description']
     readonly_fields = ['email', 'created_at', 'updated_at', 'status_updated_at']
+    actions = ['export_csv', 'export_ndjson']
     
     fieldsets = (
         ('Client Information', {
@@ -89,72 +122,143 @@ class WebsiteRequestAdmin(admin.ModelAdmin):
         return format_html('<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-weight: bold;">{}</span>', color, label)
     payment_status_display.short_description = 'Payment'
     
+    def get_urls(self):
+        urls = [
+            path(
+                'export/<str:export_format>/',
+                self.admin_site.admin_view(self.export_view),
+                name='projects_websiterequest_export',
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def export_view(self, request, export_format):
+        """Stream every row matching the changelist's current filters and search"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        if export_format not in EXPORT_FORMATS:
+            raise Http404(f"Unknown export format: {export_format}")
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        return export_response(queryset, export_format)
+    
+    def export_csv(self, request, queryset):
+        """Download the selected requests with their status history as CSV"""
+        return export_response(queryset, 'csv')
+    export_csv.short_description = 'Export selected requests (CSV)'
+    
+    def export_ndjson(self, request, queryset):
+        """Download the selected requests with their status history as NDJSON"""
+        return export_response(queryset, 'ndjson')
+    export_ndjson.short_description = 'Export selected requests (NDJSON)'
+    
     def save_model(self, request, obj, form, change):
-        """Save model and track status changes"""
-        if change:  # If editing existing object
-            old_obj = WebsiteRequest.objects.get(pk=obj.pk)
-            if old_obj.status != obj.status:
-                # Status changed - create update record
+        """Save model and record status changes; the email worker notifies the client"""
+        if change and obj.has_field_changed('status'):
+            # Status changed (detected from the values loaded with obj, no extra query)
+            old_status = obj.get_loaded_value('status')
+            with transaction.atomic():
+                obj.status_updated_at = timezone.now()
+                obj.notified_user = False
+                super().save_model(request, obj, form, change)
                 StatusUpdate.objects.create(
                     request=obj,
-                    old_status=old_obj.status,
+                    old_status=old_status,
                     new_status=obj.status,
-                    admin_message=obj.admin_notes
+                    admin_message=obj.admin_notes,
                 )
-                obj.status_updated_at = __import__('django.utils.timezone', fromlist=['now']).now()
-                obj.notified_user = False  # Reset notification flag
-                
-                # Send email notification
-                self.send_status_email(obj, old_obj.status)
+            return
         
         super().save_model(request, obj, form, change)
-    
-    def send_status_email(self, obj, old_status):
-        """Send email to client when status changes"""
-        try:
-            subject = f"Update: Your {obj.business_name} Website Request - {obj.get_status_display()}"
-            
-            context = {
-                'business_name': obj.business_name,
-                'old_status': dict(WebsiteRequest._meta.get_field('status').choices).get(old_status, old_status),
-                'new_status': obj.get_status_display(),
-                'status_emoji': obj.get_status_emoji(),
-                'admin_notes': obj.admin_notes or 'Your request is being processed.',
-                'dashboard_url': 'http://127.0.0.1:8000/dashboard/',
-            }
-            
-            message = f"""
-Hi {obj.business_name},
 
-Your website request status has been updated!
 
-OLD STATUS: {context['old_status']}
-NEW STATUS: {context['status_emoji']} {context['new_status']}
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ['subject', 'recipient_list', 'template', 'status_badge', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'template', 'created_at']
+    search_fields = ['subject', 'recipients']
+    readonly_fields = ['subject', 'body', 'from_email', 'recipients', 'template', 'attempts', 'last_error', 'created_at', 'sent_at']
+    actions = ['retry_now']
+    
+    def recipient_list(self, obj):
+        return ', '.join(obj.recipients)
+    recipient_list.short_description = 'Recipients'
+    
+    def status_badge(self, obj):
+        """Display delivery status with color coding (dead letters stand out)"""
+        colors = {
+            'pending': '#FFC107',
+            'sending': '#0D6EFD',
+            'sent': '#28A745',
+            'dead': '#DC3545',
+        }
+        color = colors.get(obj.status, '#6C757D')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 3px; font-weight: bold;" title="{}">{}</span>',
+            color,
+            obj.last_error,
+            obj.get_status_display()
+        )
+    status_badge.short_description = 'Status'
+    
+    def retry_now(self, request, queryset):
+        """Requeue selected emails (including dead letters) for immediate delivery"""
+        updated = queryset.exclude(status='sent').update(
+            status='pending',
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} email(s) requeued for delivery.")
+    retry_now.short_description = 'Retry selected emails now'
 
-NOTES FROM OUR TEAM:
-{context['admin_notes']}
 
-View your full request details here:
-{context['dashboard_url']}
+@admin.register(EmailSendMetric)
+class EmailSendMetricAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    """Individual send attempts; /metrics/email/ has the aggregated view"""
+    list_display = ['created_at', 'template', 'outcome', 'error_class', 'connect_ms', 'tls_ms', 'auth_ms', 'data_ms', 'total_ms']
+    list_filter = ['outcome', 'template', 'error_class', 'created_at']
+    date_hierarchy = 'created_at'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
 
-Best regards,
-Arka Team ✨
-            """
-            
-            send_mail(
-                subject,
-                message,
-                'noreply@arka.com',
-                [obj.email],
-                fail_silently=True,
-            )
-            
-            # Mark as notified
-            obj.notified_user = True
-            WebsiteRequest.objects.filter(pk=obj.pk).update(notified_user=True)
-            
-        except Exception as e:
-            print(f"Email notification error: {e}")
 
+class ArchivedStatusUpdateInline(admin.TabularInline):
+    model = ArchivedStatusUpdate
+    fields = ['old_status', 'new_status', 'admin_message', 'created_at', 'notified']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
+@admin.register(ArchivedWebsiteRequest)
+class ArchivedWebsiteRequestAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    """Read-only view of archived requests; the only write is restoring them"""
+    list_display = ['business_name', 'email', 'website_type', 'payment_status', 'created_at', 'archived_at']
+    list_filter = ['website_type', 'payment_status', 'archived_at']
+    search_fields = ['business_name', 'email', 'description']
+    inlines = [ArchivedStatusUpdateInline]
+    actions = ['restore_selected']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+    
+    def restore_selected(self, request, queryset):
+        """Move the selected requests and their status history back into Website Requests"""
+        restored = restore_archived_requests(queryset)
+        self.message_user(request, f"{restored} request(s) restored.")
+    restore_selected.short_description = 'Restore selected requests'
@@ -0,0 +1,254 @@
+"""
+JSON API (v1) for Arka website requests
+Clients see and create their own requests; staff can list and filter all of them.
+Lists use keyset pagination on (created_at, id), so every page costs the same
+index range scan no matter how deep it is, and `?fields=` picks the columns
+sent (large ones such as `description` only when asked for).
+"""
+
+import base64
+import binascii
+import json
+from functools import wraps
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET, require_http_methods
+from .db import retry_on_locked
+from .forms import WebsiteRequestForm
+from .models import WebsiteRequest
+from .routers import read_from_replica
+from .services import send_website_request_notifications
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Fields a client may request for their own requests, and the extra ones staff may see
+PUBLIC_FIELDS = (
+    'id', 'business_name', 'website_type', 'email', 'description', 'budget',
+    'status', 'payment_status', 'created_at', 'updated_at', 'status_updated_at',
+)
+STAFF_FIELDS = PUBLIC_FIELDS + ('user', 'admin_notes', 'payment_note', 'notified_user')
+DEFAULT_FIELDS = ('id', 'business_name', 'website_type', 'status', 'payment_status', 'created_at', 'updated_at')
+
+# Staff list filters: query parameter -> ORM lookup
+STAFF_FILTERS = {
+    'status': 'status',
+    'website_type': 'website_type',
+    'payment_status': 'payment_status',
+    'email': 'email__iexact',
+    'user': 'user_id',
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lt',
+}
+
+
+class APIError(Exception):
+    """Error answered as {"error": message} with the given HTTP status"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def api_view(view_func):
+    """Require a logged-in user and turn APIError into a JSON error response"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        try:
+            return view_func(request, *args, **kwargs)
+        except APIError as e:
+            return JsonResponse({'error': e.message}, status=e.status)
+
+    return wrapper
+
+
+def encode_cursor(website_request):
+    """Opaque cursor pointing just after `website_request` in (-created_at, -id) order"""
+    raw = f"{website_request.created_at.isoformat()}|{website_request.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor from encode_cursor()
+
+    Returns:
+        tuple: (created_at, id)
+    """
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise APIError('Invalid cursor.')
+    if created_at is None:
+        raise APIError('Invalid cursor.')
+    return created_at, pk
+
+
+def keyset_page(queryset, cursor, limit):
+    """
+    One page of `queryset` in newest-first order, starting after `cursor`
+
+    Returns:
+        tuple: (list of objects, next cursor or None)
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    rows = list(queryset[:limit + 1])
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+def _page_size(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise APIError('limit must be a number.')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _requested_fields(request):
+    """Fields to serialize, from ?fields=a,b,c (validated against the caller's role)"""
+    allowed = STAFF_FIELDS if request.user.is_staff else PUBLIC_FIELDS
+    if 'fields' not in request.GET:
+        return DEFAULT_FIELDS
+    fields = [f.strip() for f in request.GET['fields'].split(',') if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise APIError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(['id', *fields]))
+
+
+def _load_fields(fields):
+    """Model fields to load for the given output fields (the cursor needs created_at)"""
+    return [f if f != 'user' else 'user_id' for f in dict.fromkeys([*fields, 'created_at'])]
+
+
+def serialize_request(website_request, fields):
+    data = {}
+    for field in fields:
+        data[field] = website_request.user_id if field == 'user' else getattr(website_request, field)
+    return data
+
+
+def serialize_status_update(update):
+    return {
+        'id': update.pk,
+        'old_status': update.old_status,
+        'new_status': update.new_status,
+        'message': update.admin_message or '',
+        'created_at': update.created_at,
+    }
+
+
+def _visible_requests(request):
+    if request.user.is_staff:
+        return WebsiteRequest.objects.all()
+    return request.user.website_requests.all()
+
+
+def _get_visible_request(request, pk):
+    try:
+        return _visible_requests(request).get(pk=pk)
+    except WebsiteRequest.DoesNotExist:
+        raise APIError('Not found.', status=404)
+
+
+def _staff_filters(request):
+    filters = {}
+    for param, lookup in STAFF_FILTERS.items():
+        value = request.GET.get(param)
+        if not value:
+            continue
+        if param.startswith('created_'):
+            try:
+                value = parse_datetime(value)
+            except ValueError:  # well formed but impossible, e.g. month 13
+                value = None
+            if value is None:
+                raise APIError(f'{param} must be an ISO 8601 datetime.')
+            if timezone.is_naive(value):
+                value = timezone.make_aware(value)
+        elif param == 'user' and not value.isdigit():
+            raise APIError('user must be a user id.')
+        filters[lookup] = value
+    return filters
+
+
+def _list_requests(request):
+    fields = _requested_fields(request)
+    queryset = _visible_requests(request).only(*_load_fields(fields))
+    if request.user.is_staff:
+        queryset = queryset.filter(**_staff_filters(request))
+    rows, next_cursor = keyset_page(queryset, request.GET.get('cursor'), _page_size(request))
+    return JsonResponse({
+        'results': [serialize_request(row, fields) for row in rows],
+        'next_cursor': next_cursor,
+    })
+
+
+def _create_request(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            raise APIError('Request body is not valid JSON.')
+        if not isinstance(data, dict):
+            raise APIError('Request body must be a JSON object.')
+    else:
+        data = request.POST
+
+    form = WebsiteRequestForm(data)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    website_request = form.save(commit=False)
+    website_request.user = request.user
+    retry_on_locked(website_request.save)()
+    # Queue admin notification and client confirmation (delivered by the email worker)
+    send_website_request_notifications(website_request, request.user)
+    return JsonResponse(serialize_request(website_request, PUBLIC_FIELDS), status=201)
+
+
+@require_http_methods(['GET', 'POST'])
+@api_view
+def requests_collection(request):
+    """GET: list requests (own, or all for staff) | POST: submit a new request"""
+    if request.method == 'POST':
+        return _create_request(request)
+    return read_from_replica(_list_requests)(request)
+
+
+@require_GET
+@api_view
+@read_from_replica
+def request_detail(request, pk):
+    """One request, all fields visible to the caller unless ?fields= narrows them"""
+    website_request = _get_visible_request(request, pk)
+    if 'fields' in request.GET:
+        fields = _requested_fields(request)
+    else:
+        fields = STAFF_FIELDS if request.user.is_staff else PUBLIC_FIELDS
+    return JsonResponse(serialize_request(website_request, fields))
+
+
+@require_GET
+@api_view
+@read_from_replica
+def request_status_history(request, pk):
+    """Status timeline of a request, newest first"""
+    website_request = _get_visible_request(request, pk)
+    return JsonResponse({
+        'request': website_request.pk,
+        'results': [serialize_status_update(update) for update in website_request.status_updates.all()],
+    })
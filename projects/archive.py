@@ -0,0 +1,84 @@
+"""
+Archival of completed website requests
+Completed requests untouched for a while move, with their status history, into
+the Archived* tables so the hot tables (and every list, COUNT and dashboard
+query over them) only hold live work. Rows keep their primary keys both ways.
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import ArchivedStatusUpdate, ArchivedWebsiteRequest, StatusUpdate, WebsiteRequest
+
+# Columns copied between the hot and archive tables
+REQUEST_FIELDS = [
+    'id', 'user_id', 'business_name', 'website_type', 'email', 'description', 'budget', 'created_at',
+    'updated_at', 'status', 'admin_notes', 'status_updated_at', 'notified_user', 'payment_status', 'payment_note',
+]
+STATUS_UPDATE_FIELDS = [
+    'id', 'request_id', 'old_status', 'new_status', 'admin_message', 'created_at', 'notified',
+    'notified_at', 'notify_attempts', 'notify_after', 'notify_error', 'notify_hash',
+]
+
+
+def archivable_requests(older_than_days):
+    """Completed requests not modified in the last `older_than_days` days"""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return WebsiteRequest.objects.filter(status='completed', updated_at__lt=cutoff)
+
+
+def archive_batch(older_than_days, batch_size):
+    """
+    Move one batch of archivable requests and their status history to the archive
+
+    Returns:
+        int: number of requests archived (0 when nothing is left)
+    """
+    with transaction.atomic():
+        ids = list(archivable_requests(older_than_days).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        now = timezone.now()
+        ArchivedWebsiteRequest.objects.bulk_create([
+            ArchivedWebsiteRequest(archived_at=now, **row)
+            for row in WebsiteRequest.objects.filter(id__in=ids).values(*REQUEST_FIELDS)
+        ])
+        ArchivedStatusUpdate.objects.bulk_create([
+            ArchivedStatusUpdate(**row)
+            for row in StatusUpdate.objects.filter(request_id__in=ids).values(*STATUS_UPDATE_FIELDS)
+        ])
+        StatusUpdate.objects.filter(request_id__in=ids).delete()
+        WebsiteRequest.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def restore_archived_requests(queryset):
+    """
+    Move archived requests (and their status history) back into the hot tables
+
+    Args:
+        queryset (QuerySet): ArchivedWebsiteRequest rows to restore
+
+    Returns:
+        int: number of requests restored
+    """
+    with transaction.atomic():
+        ids = list(queryset.values_list('id', flat=True))
+        if not ids:
+            return 0
+        # created_at / updated_at are auto_now(_add), which bulk_create overwrites;
+        # put the original times back afterwards
+        rows = list(ArchivedWebsiteRequest.objects.filter(id__in=ids).values(*REQUEST_FIELDS))
+        requests = WebsiteRequest.objects.bulk_create([WebsiteRequest(**row) for row in rows])
+        for website_request, row in zip(requests, rows):
+            website_request.created_at = row['created_at']
+            website_request.updated_at = row['updated_at']
+        WebsiteRequest.objects.bulk_update(requests, ['created_at', 'updated_at'])
+
+        rows = list(ArchivedStatusUpdate.objects.filter(request_id__in=ids).values(*STATUS_UPDATE_FIELDS))
+        updates = StatusUpdate.objects.bulk_create([StatusUpdate(**row) for row in rows])
+        for update, row in zip(updates, rows):
+            update.created_at = row['created_at']
+        StatusUpdate.objects.bulk_update(updates, ['created_at'])
+        ArchivedWebsiteRequest.objects.filter(id__in=ids).delete()
+    return len(ids)
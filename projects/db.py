@@ -0,0 +1,72 @@
+"""
+Database helpers for the projects app
+"""
+
+import functools
+import logging
+import random
+import time
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.db.migrations.operations import AddIndex
+
+logger = logging.getLogger(__name__)
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def is_lock_error(error):
+    """Whether an OperationalError is SQLite reporting lock contention"""
+    return isinstance(error, OperationalError) and any(msg in str(error) for msg in LOCK_ERROR_MESSAGES)
+
+
+def retry_on_locked(func):
+    """
+    Retry a database write that lost the SQLite lock, with exponential backoff
+
+    Only retries outside an atomic block: once a statement fails inside a
+    transaction the whole transaction has to be retried by its owner.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        attempts = settings.DB_LOCK_RETRY_ATTEMPTS
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as e:
+                if not is_lock_error(e) or connection.in_atomic_block or attempt == attempts:
+                    raise
+                delay = settings.DB_LOCK_RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                delay += random.uniform(0, delay)  # jitter so retries don't collide again
+                logger.warning(f"{func.__qualname__} hit a locked database (attempt {attempt}), retrying in {delay:.3f}s")
+                time.sleep(delay)
+
+    return wrapper
+
+
+class AddIndexConcurrently(AddIndex):
+    """
+    AddIndex that builds the index with CREATE INDEX CONCURRENTLY on PostgreSQL
+    so the table stays writable while it builds. Other databases get a plain
+    CREATE INDEX. Migrations using it must set `atomic = False`.
+    """
+
+    def describe(self):
+        return f"Concurrently create index {self.index.name} on {self.model_name}"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if schema_editor.connection.vendor == 'postgresql':
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
@@ -0,0 +1,118 @@
+"""
+Streaming export of website requests with their status history
+Rows are read in chunks (a server-side cursor on PostgreSQL) with each chunk's
+status updates prefetched in one query, and written out as they are produced,
+so memory stays flat however many rows are exported.
+"""
+
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .models import StatusUpdate
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Cell prefixes that Excel / Sheets evaluate as a formula (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = [
+    'id', 'business_name', 'email', 'website_type', 'status', 'payment_status', 'budget',
+    'description', 'admin_notes', 'payment_note', 'user', 'created_at', 'updated_at', 'status_updated_at',
+]
+
+
+class Echo:
+    """File-like object whose write() hands the line back, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def iter_requests(queryset, chunk_size=CHUNK_SIZE):
+    """Iterate `queryset` in chunks with the user and the status history of each chunk loaded"""
+    history = Prefetch('status_updates', queryset=StatusUpdate.objects.order_by('created_at', 'id'))
+    return queryset.select_related('user').prefetch_related(history).iterator(chunk_size=chunk_size)
+
+
+def request_record(website_request):
+    """Export record for one request; `status_history` is oldest first"""
+    record = {
+        field: getattr(website_request, field) for field in EXPORT_FIELDS if field != 'user'
+    }
+    record['user'] = website_request.user.username if website_request.user else ''
+    record['status_history'] = [
+        {
+            'old_status': update.old_status,
+            'new_status': update.new_status,
+            'message': update.admin_message or '',
+            'created_at': update.created_at,
+        }
+        for update in website_request.status_updates.all()
+    ]
+    return record
+
+
+def _history_cell(history):
+    return ' | '.join(
+        f"{entry['created_at'].isoformat()} {entry['old_status']} -> {entry['new_status']}"
+        + (f": {entry['message']}" if entry['message'] else '')
+        for entry in history
+    )
+
+
+def _csv_cell(value):
+    """
+    Render one CSV cell; text that a spreadsheet would run as a formula
+    (leading =, +, -, @, tab or CR) is prefixed with a quote
+    """
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(queryset, chunk_size=CHUNK_SIZE):
+    """CSV lines: one row per request, status history flattened into one column"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS + ['status_history'])
+    for website_request in iter_requests(queryset, chunk_size):
+        record = request_record(website_request)
+        row = [record[field] for field in EXPORT_FIELDS] + [_history_cell(record['status_history'])]
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def iter_ndjson(queryset, chunk_size=CHUNK_SIZE):
+    """NDJSON lines: one JSON object per request with a nested status_history list"""
+    for website_request in iter_requests(queryset, chunk_size):
+        yield json.dumps(request_record(website_request), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def iter_export(queryset, export_format, chunk_size=CHUNK_SIZE):
+    if export_format == 'csv':
+        return iter_csv(queryset, chunk_size)
+    if export_format == 'ndjson':
+        return iter_ndjson(queryset, chunk_size)
+    raise ValueError(f"Unknown export format: {export_format}")
+
+
+def export_response(queryset, export_format):
+    """
+    Stream `queryset` as a downloadable CSV or NDJSON file
+
+    Args:
+        queryset (QuerySet): WebsiteRequest rows to export (filters and ordering are kept)
+        export_format (str): 'csv' or 'ndjson'
+    """
+    response = StreamingHttpResponse(iter_export(queryset, export_format), content_type=EXPORT_FORMATS[export_format])
+    filename = f"website-requests-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,80 @@
+"""
+Instrumented SMTP email backend for Arka
+Times the phases of every SMTP conversation (connect, TLS, auth, data) so
+projects.metrics can record where send latency goes
+"""
+
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from django.core.mail.backends.smtp import EmailBackend
+
+PHASES = ('connect', 'tls', 'auth', 'data')
+
+_local = threading.local()
+
+
+def reset_phase_timings():
+    """Start a fresh set of phase timings for the current thread's next send"""
+    _local.timings = {}
+
+
+def get_phase_timings():
+    """
+    Phase timings recorded in this thread since the last reset
+
+    Returns:
+        dict: phase name -> milliseconds (phases that did not run are absent,
+        e.g. connect/tls/auth when a pooled connection was reused)
+    """
+    return dict(getattr(_local, 'timings', {}))
+
+
+@contextmanager
+def _phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = getattr(_local, 'timings', None)
+        if timings is None:
+            timings = _local.timings = {}
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class TimedSMTPMixin:
+    """smtplib.SMTP hooks timing each protocol phase"""
+
+    def connect(self, *args, **kwargs):
+        # For SMTP_SSL the TLS handshake happens here too and counts as connect
+        with _phase('connect'):
+            return super().connect(*args, **kwargs)
+
+    def starttls(self, *args, **kwargs):
+        with _phase('tls'):
+            return super().starttls(*args, **kwargs)
+
+    def login(self, *args, **kwargs):
+        with _phase('auth'):
+            return super().login(*args, **kwargs)
+
+    def sendmail(self, *args, **kwargs):
+        with _phase('data'):
+            return super().sendmail(*args, **kwargs)
+
+
+class TimedSMTP(TimedSMTPMixin, smtplib.SMTP):
+    pass
+
+
+class TimedSMTP_SSL(TimedSMTPMixin, smtplib.SMTP_SSL):
+    pass
+
+
+class InstrumentedSMTPBackend(EmailBackend):
+    """Django's SMTP backend with per-phase timings (see get_phase_timings)"""
+
+    @property
+    def connection_class(self):
+        return TimedSMTP_SSL if self.use_ssl else TimedSMTP
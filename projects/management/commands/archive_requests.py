@@ -0,0 +1,48 @@
+"""
+Move old completed website requests into the archive tables
+Runs in small batches (one short transaction each) so it can run while the site is live
+
+Run with: python manage.py archive_requests [--days 365] [--batch-size 500] [--dry-run]
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from projects.archive import archivable_requests, archive_batch
+from projects.db import retry_on_locked
+from projects.page_cache import invalidate_page_cache
+from projects.stats import invalidate_request_stats
+
+
+class Command(BaseCommand):
+    help = 'Archive completed requests (with their status history) not modified for --days days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help='Archive completed requests untouched for this many days')
+        parser.add_argument('--batch-size', type=int, default=500, help='Requests moved per transaction')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the requests that would be archived')
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if options['dry_run']:
+            count = archivable_requests(days).count()
+            self.stdout.write(f"{count} completed request(s) older than {days} days would be archived")
+            return
+
+        archive = retry_on_locked(archive_batch)
+        started = time.monotonic()
+        total = 0
+        while True:
+            moved = archive(days, max(1, options['batch_size']))
+            if not moved:
+                break
+            total += moved
+            rate = total / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f"Archived {total} request(s) ({rate:.0f} rows/s)")
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        if total:
+            invalidate_request_stats()
+            invalidate_page_cache()
+        self.stdout.write(self.style.SUCCESS(f"✅ Archived {total} request(s) in {time.monotonic() - started:.1f}s"))
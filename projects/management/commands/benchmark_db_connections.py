@@ -0,0 +1,94 @@
+"""
+Database connection benchmark for Arka
+Compares per-request connection setup (CONN_MAX_AGE=0, Django's old default here)
+with the persistent / pooled connections configured in settings
+
+Run with: python manage.py benchmark_db_connections [--requests 200]
+"""
+
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+class Command(BaseCommand):
+    help = 'Measure per-request database connection overhead with and without persistent connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per scenario')
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+
+    def simulate_requests(self, connection, count):
+        """Mimic Django's request cycle: close_old_connections() around a trivial query"""
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            close_old_connections()  # request_started
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            close_old_connections()  # request_finished
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def simulate_unpooled_requests(self, connection, count):
+        """Open a raw driver connection per request, bypassing the pool"""
+        params = connection.get_connection_params()
+        params.pop('pool', None)
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            raw = connection.Database.connect(**params)
+            try:
+                with raw.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+            finally:
+                raw.close()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def run_scenario(self, connection, conn_max_age, count):
+        configured = connection.settings_dict['CONN_MAX_AGE']
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        try:
+            return self.simulate_requests(connection, count)
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = configured
+
+    def report(self, label, timings):
+        ordered = sorted(timings)
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        self.stdout.write(
+            f"{label:<32} mean {statistics.mean(timings):7.3f} ms   "
+            f"p50 {statistics.median(timings):7.3f} ms   p95 {p95:7.3f} ms"
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        count = options['requests']
+        configured = connection.settings_dict['CONN_MAX_AGE']
+        pooled = 'pool' in connection.settings_dict.get('OPTIONS', {})
+
+        self.stdout.write(f"Database: {connection.vendor} ({connection.settings_dict['NAME']}), {count} requests per scenario")
+        self.stdout.write('-' * 80)
+
+        if pooled:
+            fresh = self.simulate_unpooled_requests(connection, count)
+        else:
+            fresh = self.run_scenario(connection, 0, count)
+        self.report('New connection per request', fresh)
+
+        if pooled:
+            label, reused = 'Pooled connections', self.run_scenario(connection, configured, count)
+        else:
+            # CONN_MAX_AGE=None keeps the connection for the whole run if nothing is configured
+            label, reused = f'Persistent (CONN_MAX_AGE={configured})', self.run_scenario(connection, configured or None, count)
+        self.report(label, reused)
+
+        saved = statistics.mean(fresh) - statistics.mean(reused)
+        self.stdout.write('-' * 80)
+        self.stdout.write(self.style.SUCCESS(f"Connection setup saved per request: {saved:.3f} ms"))
@@ -0,0 +1,147 @@
+"""
+Email throughput benchmark for Arka
+Drives the real send paths (outbox queueing, the worker's delivery loop, the
+SMTP pool and the instrumented backend) against the in-process SMTP sink, and
+measures how much a slow SMTP server adds to POST /request-website/
+
+Runs against a throwaway test database and a local sink, so nothing is emailed.
+
+Run with: python manage.py benchmark_email [--messages 200] [--latency-ms 20] [--failure-rate 0.05]
+"""
+
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from accounts.models import User
+from projects.models import EmailOutbox, EmailSendMetric
+from projects.services import drain_outbox, send_website_request_confirmation
+from projects.smtp_pool import reset_pool
+from projects.smtp_sink import SMTPSinkServer
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, int(round(q * len(ordered))) - 1))]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark email delivery and request latency against a local SMTP sink'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=200, help='Emails per throughput scenario')
+        parser.add_argument('--requests', type=int, default=50, help='POST /request-website/ calls per latency scenario')
+        parser.add_argument('--latency-ms', type=float, default=20.0, help='Sink latency for the throughput scenarios')
+        parser.add_argument('--slow-latency-ms', type=float, default=500.0, help='Sink latency for the "slow SMTP" request scenario')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of messages the sink rejects')
+        parser.add_argument('--drop-rate', type=float, default=0.0, help='Share of SMTP commands answered by hanging up')
+        parser.add_argument('--batch-size', type=int, default=50, help='Outbox batch size')
+
+    def email_settings(self, sink, **extra):
+        return override_settings(
+            EMAIL_BACKEND='projects.mail.InstrumentedSMTPBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='benchmark',
+            EMAIL_HOST_PASSWORD='benchmark',
+            EMAIL_TIMEOUT=10,
+            **extra,
+        )
+
+    def run_throughput(self, label, sink, count, batch_size, **extra):
+        """Queue `count` emails, then time the worker's delivery loop until one pass over them is done"""
+        EmailOutbox.objects.all().delete()
+        EmailSendMetric.objects.all().delete()
+        with self.email_settings(sink, **extra):
+            reset_pool()
+            for i in range(count):
+                send_website_request_confirmation(f'client{i}@example.com', f'Benchmark {i}')
+            started = time.perf_counter()
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = drain_outbox(batch_size=batch_size)
+                if not (batch_sent or batch_failed):
+                    break  # failed rows are now backing off; one pass is what we measure
+                sent += batch_sent
+                failed += batch_failed
+            elapsed = time.perf_counter() - started
+            reset_pool()
+
+        latencies = list(EmailSendMetric.objects.values_list('total_ms', flat=True))
+        self.stdout.write(
+            f"{label:<34}{sent:>6}{failed:>8}{sent / elapsed:>10.1f}"
+            f"{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.99):>10.1f}"
+        )
+
+    def run_request_latency(self, label, sink, user, count):
+        """Time logged-in POST /request-website/ calls (emails are queued, then delivered outside the timing)"""
+        client = Client()
+        client.force_login(user)
+        timings = []
+        with self.email_settings(sink):
+            reset_pool()
+            for i in range(count):
+                data = {
+                    'business_name': f'{label} {i}',
+                    'website_type': 'business',
+                    'description': 'Benchmark request',
+                    'budget': '',
+                    'email': f'bench{i}@example.com',
+                }
+                start = time.perf_counter()
+                client.post('/request-website/', data)
+                timings.append((time.perf_counter() - start) * 1000)
+            EmailSendMetric.objects.all().delete()
+            while any(drain_outbox()):
+                pass
+            reset_pool()
+        send_ms = list(EmailSendMetric.objects.filter(outcome='sent').values_list('total_ms', flat=True))
+        per_request_smtp = statistics.mean(send_ms) * 2 if send_ms else 0.0  # admin email + confirmation
+        self.stdout.write(
+            f"{label:<34}{statistics.median(timings):>10.1f}{percentile(timings, 0.99):>10.1f}{per_request_smtp:>16.1f}"
+        )
+        return statistics.median(timings), per_request_smtp
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        latency = options['latency_ms'] / 1000
+        try:
+            self.stdout.write(
+                f"SMTP sink: {options['latency_ms']:.0f} ms latency, {options['failure_rate']:.0%} rejected, "
+                f"{options['drop_rate']:.0%} dropped; {options['messages']} messages per scenario"
+            )
+            self.stdout.write(f"{'Delivery (outbox worker)':<34}{'sent':>6}{'failed':>8}{'msg/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+            self.stdout.write('-' * 78)
+            with SMTPSinkServer(latency=latency, failure_rate=options['failure_rate'], drop_rate=options['drop_rate']) as sink:
+                self.run_throughput('Pooled connections', sink, options['messages'], options['batch_size'])
+                self.run_throughput(
+                    'New connection per message', sink, options['messages'], options['batch_size'],
+                    EMAIL_POOL_MAX_MESSAGES=1,
+                )
+
+            user = User.objects.create_user('benchmark', password='benchmark-password')
+            self.stdout.write('')
+            self.stdout.write(f"{'POST /request-website/':<34}{'p50 ms':>10}{'p99 ms':>10}{'SMTP ms/req':>16}")
+            self.stdout.write('-' * 70)
+            with SMTPSinkServer() as fast_sink:
+                fast_p50, _ = self.run_request_latency('Fast SMTP (0 ms)', fast_sink, user, options['requests'])
+            with SMTPSinkServer(latency=options['slow_latency_ms'] / 1000) as slow_sink:
+                slow_p50, smtp_ms = self.run_request_latency(
+                    f"Slow SMTP ({options['slow_latency_ms']:.0f} ms)", slow_sink, user, options['requests'],
+                )
+            self.stdout.write('-' * 70)
+            self.stdout.write(self.style.SUCCESS(
+                f"Slow SMTP adds {slow_p50 - fast_p50:+.1f} ms to the request p50 "
+                f"(sending inline would add ~{smtp_ms:.0f} ms)"
+            ))
+        finally:
+            reset_pool()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,71 @@
+"""
+Session overhead benchmark for Arka
+Drives real requests through the middleware stack with each session strategy
+and reports per-request time and django_session queries
+
+Runs against a throwaway test database, so it is safe on any environment.
+
+Run with: python manage.py benchmark_sessions [--requests 200]
+"""
+
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from accounts.models import User
+
+STRATEGIES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SCENARIOS = [
+    ('anonymous GET /', False, '/'),
+    ('logged-in GET /dashboard/', True, '/dashboard/'),
+    ('logged-in GET /request-website/', True, '/request-website/'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request session overhead of the available session strategies'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+
+    def measure(self, client, path, count):
+        timings = []
+        session_queries = 0
+        for _ in range(count):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+            session_queries += sum('django_session' in q['sql'] for q in queries.captured_queries)
+        return statistics.mean(timings), session_queries / count
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user('benchmark', password='benchmark-password')
+            self.stdout.write(f"{count} requests per scenario")
+            self.stdout.write(f"{'Strategy':<16}{'Scenario':<34}{'ms/request':>12}{'session queries':>18}")
+            self.stdout.write('-' * 80)
+            for strategy, engine in STRATEGIES.items():
+                with override_settings(SESSION_ENGINE=engine):
+                    for label, logged_in, path in SCENARIOS:
+                        client = Client()
+                        if logged_in:
+                            client.force_login(user)
+                        client.get(path)  # warm up templates and caches
+                        mean_ms, queries = self.measure(client, path, count)
+                        self.stdout.write(f"{strategy:<16}{label:<34}{mean_ms:>12.3f}{queries:>18.2f}")
+                self.stdout.write('')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
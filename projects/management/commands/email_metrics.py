@@ -0,0 +1,41 @@
+"""
+Report email send metrics (volume, failures by exception class, SMTP phase latency)
+
+Run with: python manage.py email_metrics [--minutes 60] [--format text|json|prometheus]
+"""
+
+import json
+from django.core.management.base import BaseCommand
+from projects.metrics import summarize, to_prometheus
+
+
+class Command(BaseCommand):
+    help = 'Summarize recent email sends: counts per template and outcome, errors, p50/p95/p99 per SMTP phase'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help='Window to summarize')
+        parser.add_argument('--format', choices=['text', 'json', 'prometheus'], default='text', help='Output format')
+
+    def handle(self, *args, **options):
+        summary = summarize(since_minutes=options['minutes'])
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if options['format'] == 'prometheus':
+            self.stdout.write(to_prometheus(summary), ending='')
+            return
+
+        self.stdout.write(f"Last {summary['window_minutes']} minutes: {summary['sends']} send(s), {summary['failures']} failed")
+        self.stdout.write('-' * 60)
+        for template, outcomes in summary['by_template'].items():
+            counts = ', '.join(f"{outcome} {count}" for outcome, count in sorted(outcomes.items()))
+            self.stdout.write(f"{template:<28}{counts}")
+        if summary['errors']:
+            self.stdout.write('-' * 60)
+            for error_class, count in summary['errors'].items():
+                self.stdout.write(f"{error_class:<28}{count}")
+        self.stdout.write('-' * 60)
+        self.stdout.write(f"{'Phase':<10}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+        for phase, stats in summary['latency_ms'].items():
+            values = ''.join(f"{stats[key]:>12.1f}" if stats[key] is not None else f"{'-':>12}" for key in ('p50', 'p95', 'p99'))
+            self.stdout.write(f"{phase:<10}{stats['count']:>8}{values}")
@@ -0,0 +1,144 @@
+"""
+Batched, throttled cleanup of data nobody will read again
+- expired rows in django_session (what clearsessions does, without one huge DELETE)
+- website request drafts (`website_request_data`) abandoned in live sessions
+- delivered outbox emails, already-digested admin digest entries and old send metrics
+
+Rows are deleted in small primary-key ranges with a pause between batches, so
+each write transaction is short and the site keeps serving (SQLite locks the
+whole database while a DELETE runs).
+
+Run with: python manage.py purge_stale_data [--batch-size 500] [--sleep 0.2]
+"""
+
+import time
+from datetime import timedelta
+from importlib import import_module
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from projects.db import retry_on_locked
+from projects.models import AdminDigestEntry, EmailOutbox, EmailSendMetric
+
+# Session keys written by the request_website view for visitors who are not logged in
+DRAFT_SESSION_KEY = 'website_request_data'
+DRAFT_SAVED_AT_SESSION_KEY = 'website_request_saved_at'
+
+DB_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions, abandoned request drafts and old delivered emails in small throttled batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per delete transaction')
+        parser.add_argument('--sleep', type=float, default=0.2, help='Seconds to pause between batches')
+        parser.add_argument('--draft-max-age-hours', type=int, default=72, help='Drop request drafts older than this')
+        parser.add_argument('--keep-days', type=int, default=30, help='Keep sent emails, digested entries and send metrics this long')
+
+    def purge(self, label, queryset, batch_size, pause):
+        """
+        Delete `queryset` in primary-key order, `batch_size` rows at a time
+
+        Returns:
+            int: rows deleted
+        """
+        delete = retry_on_locked(lambda pks: queryset.model.objects.filter(pk__in=pks).delete())
+        started = time.monotonic()
+        deleted = 0
+        last_pk = None
+        while True:
+            batch = queryset.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            delete(pks)
+            deleted += len(pks)
+            last_pk = pks[-1]
+            if len(pks) == batch_size:
+                time.sleep(pause)
+        self.report(label, deleted, time.monotonic() - started)
+        return deleted
+
+    def purge_drafts(self, cutoff, batch_size, pause):
+        """
+        Remove abandoned website request drafts from live database sessions
+
+        Drafts saved before the timestamp was recorded are dated by the session's
+        last write (expire_date - SESSION_COOKIE_AGE).
+        """
+        engine = import_module(settings.SESSION_ENGINE)
+        if settings.SESSION_ENGINE not in DB_SESSION_ENGINES:
+            self.stdout.write(f"Request drafts: skipped ({settings.SESSION_ENGINE} keeps no session table)")
+            return 0
+
+        started = time.monotonic()
+        cleaned = 0
+        last_key = ''
+        now = timezone.now()
+        while True:
+            sessions = list(
+                Session.objects.filter(expire_date__gte=now, session_key__gt=last_key)
+                .order_by('session_key')[:batch_size]
+            )
+            if not sessions:
+                break
+            last_key = sessions[-1].session_key
+            for session in sessions:
+                data = session.get_decoded()
+                if DRAFT_SESSION_KEY not in data:
+                    continue
+                saved_at = parse_datetime(data.get(DRAFT_SAVED_AT_SESSION_KEY) or '')
+                if saved_at is None:
+                    saved_at = session.expire_date - timedelta(seconds=settings.SESSION_COOKIE_AGE)
+                if saved_at >= cutoff:
+                    continue
+                data.pop(DRAFT_SESSION_KEY, None)
+                data.pop(DRAFT_SAVED_AT_SESSION_KEY, None)
+                # Rewrite only the payload: SessionStore.save() would push expire_date out
+                # by another SESSION_COOKIE_AGE (and break the dating fallback above).
+                # Matching on the payload we read leaves sessions the user wrote to since alone.
+                store = engine.SessionStore(session_key=session.session_key)
+                updated = retry_on_locked(
+                    Session.objects.filter(session_key=session.session_key, session_data=session.session_data).update
+                )(session_data=store.encode(data))
+                if not updated:
+                    continue
+                if hasattr(store, 'cache_key'):
+                    caches[settings.SESSION_CACHE_ALIAS].delete(store.cache_key)  # cached_db keeps a copy
+                cleaned += 1
+            if len(sessions) == batch_size:
+                time.sleep(pause)
+        self.report('Request drafts', cleaned, time.monotonic() - started)
+        return cleaned
+
+    def report(self, label, rows, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        self.stdout.write(f"{label + ':':<26}{rows:>8} row(s) in {elapsed:6.1f}s ({rate:.0f} rows/s)")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        pause = options['sleep']
+        now = timezone.now()
+        keep_until = now - timedelta(days=options['keep_days'])
+
+        total = self.purge('Expired sessions', Session.objects.filter(expire_date__lt=now), batch_size, pause)
+        total += self.purge_drafts(now - timedelta(hours=options['draft_max_age_hours']), batch_size, pause)
+        total += self.purge(
+            'Sent emails', EmailOutbox.objects.filter(status='sent', sent_at__lt=keep_until), batch_size, pause,
+        )
+        total += self.purge(
+            'Digested entries', AdminDigestEntry.objects.filter(digested_at__lt=keep_until), batch_size, pause,
+        )
+        total += self.purge(
+            'Email send metrics', EmailSendMetric.objects.filter(created_at__lt=keep_until), batch_size, pause,
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ Purged {total} row(s)"))
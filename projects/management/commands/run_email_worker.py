@@ -0,0 +1,53 @@
+"""
+Email worker for Arka
+Drains the email outbox, retrying failed sends with exponential backoff,
+sends pending status-change notifications to clients, and sends the admin
+digest when its window has elapsed
+
+Run with: python manage.py run_email_worker
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from projects.services import drain_outbox, flush_admin_digest, notify_status_updates
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox (retries with backoff, dead-letters after max attempts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails claimed per batch')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when the outbox is empty')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(self.style.SUCCESS('📤 Email worker started'))
+
+        try:
+            while True:
+                digested = flush_admin_digest()
+                if digested:
+                    self.stdout.write(f"Queued admin digest with {digested} item(s)")
+
+                notified, notify_failed = notify_status_updates(batch_size=batch_size)
+                if notified or notify_failed:
+                    self.stdout.write(f"Status notifications: sent {notified}, failed {notify_failed}")
+
+                sent, failed = drain_outbox(batch_size=batch_size)
+                if sent or failed:
+                    self.stdout.write(f"Sent {sent}, failed {failed}")
+
+                busy = sent or failed or notified or notify_failed
+                if options['once']:
+                    # Keep going until the due backlog is empty
+                    if busy:
+                        continue
+                    break
+
+                if not busy:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Email worker stopped'))
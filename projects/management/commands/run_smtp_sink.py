@@ -0,0 +1,42 @@
+"""
+Local SMTP sink for Arka
+Accepts and discards mail so the email worker can run
+without reaching real mailboxes. Point the app at it with
+EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025 EMAIL_USE_TLS=False
+
+Run with: python manage.py run_smtp_sink [--port 1025] [--latency-ms 0] [--failure-rate 0] [--drop-rate 0]
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from projects.smtp_sink import SMTPSinkServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server that discards mail (optional latency, failures and dropped connections)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+        parser.add_argument('--port', type=int, default=1025, help='Port to bind')
+        parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay before the greeting, AUTH and end-of-DATA replies')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of messages rejected with a 451')
+        parser.add_argument('--drop-rate', type=float, default=0.0, help='Share of commands answered by hanging up')
+
+    def handle(self, *args, **options):
+        sink = SMTPSinkServer(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency_ms'] / 1000,
+            failure_rate=options['failure_rate'],
+            drop_rate=options['drop_rate'],
+        )
+        sink.start()
+        self.stdout.write(self.style.SUCCESS(f"📭 SMTP sink listening on {options['host']}:{sink.port}"))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.stop()
+            self.stdout.write(f"Sink stats: {sink.stats}")
@@ -0,0 +1,23 @@
+"""
+Send the batched admin digest email
+Useful from cron when the email worker is not running
+
+Run with: python manage.py send_admin_digest [--force]
+"""
+
+from django.core.management.base import BaseCommand
+from projects.services import flush_admin_digest
+
+
+class Command(BaseCommand):
+    help = 'Queue the admin digest email for pending new requests and contact messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Send pending entries without waiting for the digest window')
+
+    def handle(self, *args, **options):
+        count = flush_admin_digest(force=options['force'])
+        if count:
+            self.stdout.write(self.style.SUCCESS(f"✅ Digest queued with {count} item(s)"))
+        else:
+            self.stdout.write('No digest due')
@@ -0,0 +1,122 @@
+"""
+SQLite write concurrency stress test for Arka
+Runs concurrent writers (WebsiteRequest + StatusUpdate + session rows) against a
+scratch copy of the schema and reports sustained writes per second
+
+Run with: python manage.py stress_sqlite_writes [--threads 8] [--duration 10] [--baseline]
+"""
+
+import copy
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from projects.db import is_lock_error, retry_on_locked
+from projects.models import StatusUpdate, WebsiteRequest
+
+STRESS_ALIAS = 'sqlite_stress'
+
+
+class Command(BaseCommand):
+    help = 'Measure sustained SQLite write throughput with concurrent writers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent writer threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+        parser.add_argument(
+            '--baseline', action='store_true',
+            help='Use SQLite defaults (rollback journal, deferred transactions, no retries) for comparison',
+        )
+
+    def configure_database(self, path, baseline):
+        options = {} if baseline else dict(settings.DATABASES['default'].get('OPTIONS', {}))
+        if not baseline and 'init_command' not in options:
+            options['init_command'] = ';'.join(f'PRAGMA {k}={v}' for k, v in settings.SQLITE_PRAGMAS.items())
+            options['transaction_mode'] = 'IMMEDIATE'
+        stress = copy.deepcopy(connections.settings['default'])
+        stress.update({'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, 'OPTIONS': options})
+        connections.settings[STRESS_ALIAS] = stress
+        call_command('migrate', database=STRESS_ALIAS, verbosity=0)
+
+    def write_once(self, worker, sequence):
+        """One request's worth of writes: a new request, its status update and a session"""
+        with transaction.atomic(using=STRESS_ALIAS):
+            website_request = WebsiteRequest.objects.using(STRESS_ALIAS).create(
+                business_name=f'Stress {worker}-{sequence}',
+                email=f'stress{worker}@example.com',
+                description='Concurrency stress test',
+            )
+            StatusUpdate.objects.using(STRESS_ALIAS).create(
+                request=website_request, old_status='new', new_status='contacted',
+            )
+        Session.objects.using(STRESS_ALIAS).create(
+            session_key=get_random_string(32),
+            session_data=SessionStore().encode({'website_request_data': {'business_name': website_request.business_name}}),
+            expire_date=timezone.now() + timedelta(seconds=settings.SESSION_COOKIE_AGE),
+        )
+
+    def worker(self, worker, deadline, baseline, results):
+        write = self.write_once if baseline else retry_on_locked(self.write_once)
+        done = errors = 0
+        latencies = []
+        try:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    write(worker, done + errors)
+                    done += 1
+                    latencies.append(time.perf_counter() - start)
+                except OperationalError as e:
+                    if not is_lock_error(e):
+                        raise
+                    errors += 1
+        finally:
+            connections[STRESS_ALIAS].close()
+            results.append((done, errors, latencies))
+
+    def handle(self, *args, **options):
+        fd, path = tempfile.mkstemp(suffix='.sqlite3', prefix='arka-stress-')
+        os.close(fd)
+        try:
+            self.configure_database(path, options['baseline'])
+            mode = 'baseline (SQLite defaults)' if options['baseline'] else 'tuned (WAL, busy_timeout, IMMEDIATE, retries)'
+            self.stdout.write(f"Mode: {mode}, {options['threads']} writer threads, {options['duration']:.0f}s")
+
+            results = []
+            deadline = time.monotonic() + options['duration']
+            threads = [
+                threading.Thread(target=self.worker, args=(i, deadline, options['baseline'], results))
+                for i in range(options['threads'])
+            ]
+            started = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+
+            done = sum(r[0] for r in results)
+            errors = sum(r[1] for r in results)
+            latencies = sorted(latency for r in results for latency in r[2])
+            self.stdout.write('-' * 60)
+            self.stdout.write(f"Write transactions:    {done} ({done * 3} rows)")
+            self.stdout.write(f"Lock errors:           {errors}")
+            if latencies:
+                p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+                self.stdout.write(f"p99 latency:           {p99:.1f} ms")
+            self.stdout.write(self.style.SUCCESS(f"Sustained throughput:  {done / elapsed:.1f} transactions/s ({done * 3 / elapsed:.1f} rows/s)"))
+        finally:
+            if STRESS_ALIAS in connections.settings:
+                connections[STRESS_ALIAS].close()
+            for suffix in ('', '-wal', '-shm', '-journal'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
@@ -0,0 +1,162 @@
+"""
+Email delivery metrics for Arka
+Every send is recorded as an EmailSendMetric row (template, outcome by
+exception class, SMTP phase timings). Rows are written by whichever process
+sends, so the web workers and the email worker share one queryable registry;
+summarize() answers "p95 SMTP latency" or "failures in the last hour", and
+to_prometheus() exports it.
+"""
+
+import logging
+import smtplib
+import socket
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from django.utils import timezone
+from .mail import PHASES, get_phase_timings, reset_phase_timings
+from .models import EmailSendMetric
+from .smtp_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def classify_error(error):
+    """Map a send exception to an outcome (EMAIL_OUTCOME_CHOICES)"""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return 'auth_error'
+    if isinstance(error, (socket.timeout, TimeoutError)):
+        return 'timeout'
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError)):
+        return 'connection_error'
+    if isinstance(error, smtplib.SMTPException):
+        return 'smtp_error'
+    if isinstance(error, OSError):
+        return 'connection_error'
+    return 'error'
+
+
+def record_send(template, total_ms, error=None):
+    """
+    Store one send attempt with the phase timings captured by the SMTP backend
+
+    Metrics must never break delivery, so storage errors are only logged.
+    """
+    phases = get_phase_timings()
+    try:
+        EmailSendMetric.objects.create(
+            template=template or 'other',
+            outcome='sent' if error is None else classify_error(error),
+            error_class='' if error is None else error.__class__.__name__,
+            connect_ms=phases.get('connect'),
+            tls_ms=phases.get('tls'),
+            auth_ms=phases.get('auth'),
+            data_ms=phases.get('data'),
+            total_ms=total_ms,
+        )
+    except Exception as e:
+        logger.warning(f"Could not record email metric: {e}")
+
+
+def send_with_metrics(message, template):
+    """
+    Send an EmailMessage through the SMTP pool and record the attempt
+
+    Args:
+        message (EmailMessage): The email to send
+        template (str): Kind of email (e.g. 'confirmation', 'status_update')
+
+    Raises:
+        Exception: Whatever the send raised, after it has been recorded
+    """
+    reset_phase_timings()
+    started = time.perf_counter()
+    try:
+        get_pool().send_message(message)
+    except Exception as e:
+        record_send(template, (time.perf_counter() - started) * 1000, error=e)
+        raise
+    record_send(template, (time.perf_counter() - started) * 1000)
+
+
+def _quantile(ordered, q):
+    """Nearest-rank quantile of a sorted list"""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, int(round(q * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(since_minutes=60):
+    """
+    Summarize sends in the last `since_minutes` minutes
+
+    Returns:
+        dict: window, totals by template and outcome, failures by exception
+        class, and p50/p95/p99 (ms) for each SMTP phase and the whole send
+    """
+    since = timezone.now() - timedelta(minutes=since_minutes)
+    rows = EmailSendMetric.objects.filter(created_at__gte=since).values_list(
+        'template', 'outcome', 'error_class', 'connect_ms', 'tls_ms', 'auth_ms', 'data_ms', 'total_ms',
+    )
+
+    by_template = defaultdict(Counter)
+    errors = Counter()
+    timings = defaultdict(list)
+    for template, outcome, error_class, *durations in rows.iterator():
+        by_template[template][outcome] += 1
+        if error_class:
+            errors[error_class] += 1
+        for phase, value in zip(PHASES + ('total',), durations):
+            if value is not None:
+                timings[phase].append(value)
+
+    latency = {}
+    for phase in PHASES + ('total',):
+        ordered = sorted(timings[phase])
+        latency[phase] = {
+            'count': len(ordered),
+            **{f'p{int(q * 100)}': _quantile(ordered, q) for q in QUANTILES},
+        }
+
+    sends = sum(sum(outcomes.values()) for outcomes in by_template.values())
+    failures = sum(count for outcomes in by_template.values() for outcome, count in outcomes.items() if outcome != 'sent')
+    return {
+        'window_minutes': since_minutes,
+        'sends': sends,
+        'failures': failures,
+        'by_template': {template: dict(outcomes) for template, outcomes in sorted(by_template.items())},
+        'errors': dict(errors.most_common()),
+        'latency_ms': latency,
+    }
+
+
+def to_prometheus(summary):
+    """Render a summarize() result in the Prometheus text exposition format"""
+    window = f'{summary["window_minutes"]}m'
+    lines = [
+        '# HELP arka_email_sends Email send attempts in the window, by template and outcome',
+        '# TYPE arka_email_sends gauge',
+    ]
+    for template, outcomes in summary['by_template'].items():
+        for outcome, count in outcomes.items():
+            lines.append(f'arka_email_sends{{window="{window}",template="{template}",outcome="{outcome}"}} {count}')
+    lines += [
+        '# HELP arka_email_errors Failed email sends in the window, by exception class',
+        '# TYPE arka_email_errors gauge',
+    ]
+    for error_class, count in summary['errors'].items():
+        lines.append(f'arka_email_errors{{window="{window}",error_class="{error_class}"}} {count}')
+    lines += [
+        '# HELP arka_email_latency_ms Email send latency in the window, by SMTP phase',
+        '# TYPE arka_email_latency_ms summary',
+    ]
+    for phase, stats in summary['latency_ms'].items():
+        for q in QUANTILES:
+            value = stats[f'p{int(q * 100)}']
+            if value is not None:
+                lines.append(f'arka_email_latency_ms{{window="{window}",phase="{phase}",quantile="{q}"}} {value:.3f}')
+        lines.append(f'arka_email_latency_ms_count{{window="{window}",phase="{phase}"}} {stats["count"]}')
+    return '\n'.join(lines) + '\n'
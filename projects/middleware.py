@@ -0,0 +1,41 @@
+"""
+HTTP middleware for Arka
+"""
+
+import re
+from django.conf import settings
+
+STYLESHEET_RE = re.compile(r'<link rel="stylesheet" href="([^"]+)"')
+
+
+class PreloadStylesheetsMiddleware:
+    """
+    Advertise a page's own stylesheets with `Link: rel=preload` headers
+
+    Browsers (and CDNs that turn Link headers into early hints) can start
+    fetching the CSS bundles before they have parsed the HTML. Only files
+    under STATIC_URL are announced; third-party CDN links are left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.status_code != 200
+            or not response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+
+        content = response.content.decode(response.charset, errors='ignore')
+        links = [
+            f'<{href}>; rel=preload; as=style'
+            for href in dict.fromkeys(STYLESHEET_RE.findall(content))
+            if href.startswith(settings.STATIC_URL)
+        ]
+        if links:
+            existing = response.get('Link')
+            response['Link'] = ', '.join(([existing] if existing else []) + links)
+        return response
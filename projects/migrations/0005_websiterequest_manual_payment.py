@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_payment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='websiterequest',
+            name='payment_note',
+            field=models.TextField(blank=True, help_text='Notes about manual payment (e.g. "Paid via GPay on DD/MM")', null=True),
+        ),
+        migrations.AddField(
+            model_name='websiterequest',
+            name='payment_status',
+            field=models.CharField(choices=[('not_discussed', 'Not Discussed'), ('pending', 'Pending'), ('paid', 'Paid')], default='not_discussed', help_text='Manual payment status managed by admin', max_length=20),
+        ),
+        migrations.DeleteModel(
+            name='Payment',
+        ),
+    ]
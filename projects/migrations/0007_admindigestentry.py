@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminDigestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('website_request', 'Website Request'), ('contact', 'Contact Message')], max_length=20)),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('digested_at', models.DateTimeField(blank=True, help_text='When this entry went out in a digest', null=True)),
+            ],
+            options={
+                'verbose_name': 'Admin Digest Entry',
+                'verbose_name_plural': 'Admin Digest Entries',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['digested_at', 'created_at'], name='digest_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+from projects.db import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('projects', '0007_admindigestentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='statusupdate',
+            index=models.Index(fields=['request', '-created_at'], name='statusupdate_request_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='statusupdate',
+            index=models.Index(condition=models.Q(('notified', False)), fields=['created_at'], name='statusupdate_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='websiterequest',
+            index=models.Index(fields=['user', '-created_at'], name='request_user_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='websiterequest',
+            index=models.Index(fields=['status', '-created_at'], name='request_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='websiterequest',
+            index=models.Index(fields=['website_type', '-created_at'], name='request_type_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='websiterequest',
+            index=models.Index(fields=['email'], name='request_email_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='websiterequest',
+            index=models.Index(condition=models.Q(('status', 'completed'), _negated=True), fields=['-created_at'], name='request_open_created_idx'),
+        ),
+    ]
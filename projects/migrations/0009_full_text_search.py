@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:30
+
+from django.db import migrations
+
+from projects.search import install_search_indexes, uninstall_search_indexes
+
+
+def create_search_indexes(apps, schema_editor):
+    install_search_indexes(schema_editor)
+
+
+def drop_search_indexes(apps, schema_editor):
+    uninstall_search_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('projects', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_full_text_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedWebsiteRequest',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('business_name', models.CharField(max_length=200)),
+                ('website_type', models.CharField(choices=[('ecommerce', 'E-Commerce Store'), ('blog', 'Blog/Content Site'), ('portfolio', 'Portfolio/Resume'), ('business', 'Business Website'), ('landing', 'Landing Page'), ('saas', 'SaaS Application'), ('social', 'Social Network'), ('other', 'Other')], max_length=50)),
+                ('email', models.EmailField(max_length=254)),
+                ('description', models.TextField()),
+                ('budget', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('new', '🆕 New'), ('contacted', '📞 Contacted'), ('in_progress', '⚙️ In Progress'), ('completed', '✅ Completed')], max_length=20)),
+                ('admin_notes', models.TextField(blank=True, null=True)),
+                ('status_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('notified_user', models.BooleanField(default=False)),
+                ('payment_status', models.CharField(choices=[('not_discussed', 'Not Discussed'), ('pending', 'Pending'), ('paid', 'Paid')], max_length=20)),
+                ('payment_note', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_website_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Website Request',
+                'verbose_name_plural': 'Archived Website Requests',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedStatusUpdate',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('old_status', models.CharField(choices=[('new', '🆕 New'), ('contacted', '📞 Contacted'), ('in_progress', '⚙️ In Progress'), ('completed', '✅ Completed')], max_length=20)),
+                ('new_status', models.CharField(choices=[('new', '🆕 New'), ('contacted', '📞 Contacted'), ('in_progress', '⚙️ In Progress'), ('completed', '✅ Completed')], max_length=20)),
+                ('admin_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('notified', models.BooleanField(default=False)),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_updates', to='projects.archivedwebsiterequest')),
+            ],
+            options={
+                'verbose_name': 'Archived Status Update',
+                'verbose_name_plural': 'Archived Status Updates',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedwebsiterequest',
+            index=models.Index(fields=['user', '-created_at'], name='archived_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedwebsiterequest',
+            index=models.Index(fields=['email'], name='archived_email_idx'),
+        ),
+    ]
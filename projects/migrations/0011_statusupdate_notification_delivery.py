@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def retire_old_unnotified(apps, schema_editor):
+    # Updates whose synchronous email failed before this migration are not sent
+    # late by the new worker; staff can resend them from the admin on purpose
+    StatusUpdate = apps.get_model('projects', 'StatusUpdate')
+    StatusUpdate.objects.using(schema_editor.connection.alias).filter(notified=False).update(
+        notify_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        notify_error='Not sent: created before queued status notifications',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statusupdate',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='statusupdate',
+            name='notify_after',
+            field=models.DateTimeField(blank=True, help_text='Not claimed before this time (worker lease or retry backoff)', null=True),
+        ),
+        migrations.AddField(
+            model_name='statusupdate',
+            name='notify_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='statusupdate',
+            name='notify_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(retire_old_unnotified, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_statusupdate_notification_delivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of sender, recipients, subject and body (duplicate suppression)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='statusupdate',
+            name='notify_hash',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the email sent for this update', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(fields=['content_hash', 'created_at'], name='outbox_hash_created_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_notification_dedupe'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='template',
+            field=models.CharField(blank=True, default='', help_text='Kind of email, for per-template metrics', max_length=50),
+        ),
+        migrations.CreateModel(
+            name='EmailSendMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('template', models.CharField(max_length=50)),
+                ('outcome', models.CharField(choices=[('sent', 'Sent'), ('auth_error', 'Authentication Error'), ('timeout', 'Timeout'), ('connection_error', 'Connection Error'), ('smtp_error', 'SMTP Error'), ('error', 'Other Error')], max_length=20)),
+                ('error_class', models.CharField(blank=True, default='', max_length=100)),
+                ('connect_ms', models.FloatField(blank=True, null=True)),
+                ('tls_ms', models.FloatField(blank=True, null=True)),
+                ('auth_ms', models.FloatField(blank=True, null=True)),
+                ('data_ms', models.FloatField(blank=True, null=True)),
+                ('total_ms', models.FloatField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Email Send Metric',
+                'verbose_name_plural': 'Email Send Metrics',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='emailmetric_created_idx')],
+            },
+        ),
+    ]
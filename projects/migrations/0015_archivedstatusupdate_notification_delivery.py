@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-18 03:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def retire_archived_unnotified(apps, schema_editor):
+    # Rows archived before this migration lost their delivery state; never email
+    # clients about them after a restore (staff can resend from the admin)
+    ArchivedStatusUpdate = apps.get_model('projects', 'ArchivedStatusUpdate')
+    ArchivedStatusUpdate.objects.using(schema_editor.connection.alias).filter(notified=False).update(
+        notify_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        notify_error='Not sent: archived before notification state was kept',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedstatusupdate',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedstatusupdate',
+            name='notify_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedstatusupdate',
+            name='notify_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedstatusupdate',
+            name='notify_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='archivedstatusupdate',
+            name='notify_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(retire_archived_unnotified, migrations.RunPython.noop),
+    ]
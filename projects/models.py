@@ -79,6 +79,58 @@ class WebsiteRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Website Request'
         verbose_name_plural = 'Website Requests'
+        indexes = [
+            # Client dashboard: a user's requests, newest first
+            models.Index(fields=['user', '-created_at'], name='request_user_created_idx'),
+            # Admin changelist filters, newest first
+            models.Index(fields=['status', '-created_at'], name='request_status_created_idx'),
+            models.Index(fields=['website_type', '-created_at'], name='request_type_created_idx'),
+            # Lookups by client email
+            models.Index(fields=['email'], name='request_email_idx'),
+            # Open (non-completed) requests only; completed rows dominate over time
+            models.Index(fields=['-created_at'], condition=~models.Q(status='completed'), name='request_open_created_idx'),
+        ]
+    
+    # Fields whose loaded values are remembered so changes can be detected without a query
+    TRACKED_FIELDS = ('status', 'admin_notes', 'payment_status')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.TRACKED_FIELDS
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        refreshed = [name for name in self.TRACKED_FIELDS if name in self.__dict__ and (fields is None or name in fields)]
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), **{name: self.__dict__[name] for name in refreshed}}
+    
+    def get_loaded_value(self, field_name):
+        """Value of a tracked field as it was loaded from (or last saved to) the database"""
+        return getattr(self, '_loaded_values', {}).get(field_name)
+    
+    def get_changed_fields(self):
+        """
+        Tracked fields changed since the instance was loaded or last saved
+        
+        Returns:
+            dict: field name -> (old value, new value); empty for unsaved instances
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        return {
+            name: (old, getattr(self, name))
+            for name, old in loaded.items()
+            if old != getattr(self, name)
+        }
+    
+    def has_field_changed(self, field_name):
+        return field_name in self.get_changed_fields()
     
     def __str__(self):
         return f"{self.business_name} - {self.get_status_display()}"
@@ -107,10 +159,216 @@ class StatusUpdate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     notified = models.BooleanField(default=False)
     
+    # Client notification delivery (see services.notify_status_updates)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    notify_attempts = models.PositiveIntegerField(default=0)
+    notify_after = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Not claimed before this time (worker lease or retry backoff)",
+    )
+    notify_error = models.TextField(blank=True, default='')
+    notify_hash = models.CharField(max_length=64, blank=True, default='', help_text="Content hash of the email sent for this update")
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Status Update'
         verbose_name_plural = 'Status Updates'
+        indexes = [
+            # Status timeline of a request, newest first (dashboard prefetch)
+            models.Index(fields=['request', '-created_at'], name='statusupdate_request_idx'),
+            # Updates still waiting for a client notification
+            models.Index(fields=['created_at'], condition=models.Q(notified=False), name='statusupdate_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.request.business_name}: {self.old_status} → {self.new_status}"
+
+
+OUTBOX_STATUS_CHOICES = [
+    ('pending', '⏳ Pending'),
+    ('sending', '📤 Sending'),
+    ('sent', '✅ Sent'),
+    ('dead', '☠️ Dead Letter'),
+]
+
+
+class EmailOutbox(models.Model):
+    """Durable queue of outgoing emails, delivered by the email worker"""
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list, help_text="List of recipient email addresses")
+    
+    # Delivery state
+    status = models.CharField(max_length=20, choices=OUTBOX_STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    content_hash = models.CharField(max_length=64, blank=True, default='', help_text="Hash of sender, recipients, subject and body (duplicate suppression)")
+    template = models.CharField(max_length=50, blank=True, default='', help_text="Kind of email, for per-template metrics")
+    
+    # Metadata
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outgoing Email'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx'),
+            # Recent identical emails (queue_email de-duplication)
+            models.Index(fields=['content_hash', 'created_at'], name='outbox_hash_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)} ({self.get_status_display()})"
+
+
+DIGEST_KIND_CHOICES = [
+    ('website_request', 'Website Request'),
+    ('contact', 'Contact Message'),
+]
+
+
+class AdminDigestEntry(models.Model):
+    """Admin notification held back for the next batched digest email"""
+    
+    kind = models.CharField(max_length=20, choices=DIGEST_KIND_CHOICES)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    created_at = models.DateTimeField(default=timezone.now)
+    digested_at = models.DateTimeField(null=True, blank=True, help_text="When this entry went out in a digest")
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Admin Digest Entry'
+        verbose_name_plural = 'Admin Digest Entries'
+        indexes = [
+            models.Index(fields=['digested_at', 'created_at'], name='digest_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.subject}"
+
+
+EMAIL_OUTCOME_CHOICES = [
+    ('sent', 'Sent'),
+    ('auth_error', 'Authentication Error'),
+    ('timeout', 'Timeout'),
+    ('connection_error', 'Connection Error'),
+    ('smtp_error', 'SMTP Error'),
+    ('error', 'Other Error'),
+]
+
+
+class EmailSendMetric(models.Model):
+    """One email send attempt: template, outcome and SMTP phase timings (see projects.metrics)"""
+    
+    template = models.CharField(max_length=50)
+    outcome = models.CharField(max_length=20, choices=EMAIL_OUTCOME_CHOICES)
+    error_class = models.CharField(max_length=100, blank=True, default='')
+    
+    # Milliseconds; connect/tls/auth are null when a pooled connection was reused
+    connect_ms = models.FloatField(null=True, blank=True)
+    tls_ms = models.FloatField(null=True, blank=True)
+    auth_ms = models.FloatField(null=True, blank=True)
+    data_ms = models.FloatField(null=True, blank=True)
+    total_ms = models.FloatField()
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Email Send Metric'
+        verbose_name_plural = 'Email Send Metrics'
+        indexes = [
+            models.Index(fields=['created_at'], name='emailmetric_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.template}: {self.outcome} ({self.total_ms:.0f} ms)"
+
+
+class ArchivedWebsiteRequest(models.Model):
+    """
+    Completed request moved out of the hot WebsiteRequest table
+    
+    Keeps the original primary key so a restore puts the row back unchanged.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='archived_website_requests')
+    business_name = models.CharField(max_length=200)
+    website_type = models.CharField(max_length=50, choices=WEBSITE_TYPES)
+    email = models.EmailField()
+    description = models.TextField()
+    budget = models.CharField(max_length=50, blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    admin_notes = models.TextField(blank=True, null=True)
+    status_updated_at = models.DateTimeField(null=True, blank=True)
+    notified_user = models.BooleanField(default=False)
+    payment_status = models.CharField(max_length=20, choices=PAYMENT_STATUS_CHOICES)
+    payment_note = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Website Request'
+        verbose_name_plural = 'Archived Website Requests'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='archived_user_created_idx'),
+            models.Index(fields=['email'], name='archived_email_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.business_name} (archived)"
+
+
+class ArchivedStatusUpdate(models.Model):
+    """Status history of an archived request (original primary key kept)"""
+    
+    id = models.BigIntegerField(primary_key=True)
+    request = models.ForeignKey(ArchivedWebsiteRequest, on_delete=models.CASCADE, related_name='status_updates')
+    old_status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    new_status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    admin_message = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    notified = models.BooleanField(default=False)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    notify_attempts = models.PositiveIntegerField(default=0)
+    notify_after = models.DateTimeField(null=True, blank=True)
+    notify_error = models.TextField(blank=True, default='')
+    notify_hash = models.CharField(max_length=64, blank=True, default='')
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Status Update'
+        verbose_name_plural = 'Archived Status Updates'
     
     def __str__(self):
         return f"{self.request.business_name}: {self.old_status} → {self.new_status}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a running import_requests job
+    
+    Updated in the same transaction as each inserted batch, so after a crash
+    the stored row number always matches what was committed.
+    """
+    
+    name = models.CharField(max_length=500, unique=True)
+    source = models.CharField(max_length=500)
+    row = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Import Checkpoint'
+        verbose_name_plural = 'Import Checkpoints'
+    
+    def __str__(self):
+        return f"{self.name}: row {self.row}"
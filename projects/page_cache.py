@@ -0,0 +1,99 @@
+"""
+Full-page cache for Arka's anonymous public pages
+The rendered HTML is shared between anonymous visitors; the CSRF token is
+swapped for a placeholder before caching and filled in per request. Pages live
+in the default cache, which must be shared by all processes so that an
+invalidation from any worker or management command reaches every worker.
+"""
+
+import hashlib
+import re
+from functools import wraps
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+CSRF_PLACEHOLDER = '__ARKA_CSRF_TOKEN__'
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+GENERATION_KEY = 'projects:page-cache-generation'
+
+
+def _generation():
+    """Current cache generation; bumping it invalidates every cached page at once"""
+    return cache.get_or_set(GENERATION_KEY, 1, None)
+
+
+def invalidate_page_cache():
+    """Drop all cached anonymous pages (e.g. when request counts change)"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def _cache_key(request):
+    path = hashlib.md5(request.path.encode()).hexdigest()
+    return f'projects:page:{_generation()}:{path}'
+
+
+def _is_cacheable_request(request):
+    """
+    Anonymous GET/HEAD without a query string or pending flash messages
+
+    Query strings are never cached (nor part of the key), so visitors cannot
+    fill the cache with `?x=<random>` variants of a page.
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.GET
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def _set_headers(response):
+    # The page embeds a per-visitor CSRF token and differs for logged-in users,
+    # so only the browser may keep it and it must revalidate
+    patch_vary_headers(response, ['Cookie'])
+    patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def anonymous_page_cache(view_func):
+    """
+    Serve a view's HTML from the cache for anonymous visitors
+
+    Logged-in users, non-GET requests, requests with a query string and
+    requests with flash messages always reach the view. Cached pages expire after PAGE_CACHE_SECONDS or when
+    invalidate_page_cache() is called.
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        key = _cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            if CSRF_PLACEHOLDER in content:
+                content = content.replace(CSRF_PLACEHOLDER, get_token(request))
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'HIT'
+            return _set_headers(response)
+
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            if hasattr(response, 'render'):
+                response.render()
+            content = response.content.decode(response.charset)
+            shared = CSRF_INPUT_RE.sub(f'name="csrfmiddlewaretoken" value="{CSRF_PLACEHOLDER}"', content)
+            cache.set(key, (shared, response['Content-Type']), settings.PAGE_CACHE_SECONDS)
+            response['X-Page-Cache'] = 'MISS'
+        return _set_headers(response)
+
+    return wrapper
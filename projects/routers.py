@@ -0,0 +1,90 @@
+"""
+Read-replica routing for Arka
+Writes always go to the primary ('default'). Reads go to a replica only inside
+views marked with @read_from_replica (and admin changelists), and never for a
+user who wrote something within the last REPLICA_PIN_SECONDS, so they always
+see their own changes.
+"""
+
+import random
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+PIN_COOKIE_NAME = 'arka_pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+class ReplicaRouter:
+    """Database router sending reads to a replica when the current request allows it"""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and settings.REPLICA_DATABASES:
+            return random.choice(settings.REPLICA_DATABASES)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication; other aliases (e.g. the
+        # stress_sqlite_writes scratch database) are migrated as usual
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+def is_pinned_to_primary(request):
+    """Whether this request must read from the primary (unsafe method or a recent write)"""
+    return request.method not in SAFE_METHODS or PIN_COOKIE_NAME in request.COOKIES
+
+
+def read_from_replica(view_func):
+    """Let a read-only view read from a replica unless the user recently wrote"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    return wrapper
+
+
+class PrimaryPinningMiddleware:
+    """
+    After a request that may have written (POST, PUT, PATCH, DELETE), set a short-lived
+    cookie that keeps the user's reads on the primary until replicas have caught up
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and settings.REPLICA_DATABASES:
+            response.set_cookie(
+                PIN_COOKIE_NAME, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
+
+
+class ReplicaChangeListMixin:
+    """ModelAdmin mixin serving changelist pages (GET) from a replica"""
+
+    def changelist_view(self, request, extra_context=None):
+        return read_from_replica(super().changelist_view)(request, extra_context)
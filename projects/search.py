@@ -0,0 +1,170 @@
+"""
+Full-text search for the projects app
+SQLite uses FTS5 external-content tables kept in sync by triggers; PostgreSQL
+uses GIN indexes over a tsvector expression. Both stay current on every write,
+including bulk inserts and queryset updates that skip model signals.
+"""
+
+import logging
+import re
+from django.contrib.admin.views.main import ORDER_VAR
+from django.db import DatabaseError, connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
+
+# Searchable tables: source table -> (FTS5 table / GIN index name, text columns)
+SEARCH_INDEXES = {
+    'projects_websiterequest': ('projects_websiterequest_fts', ['business_name', 'email', 'description']),
+    'projects_statusupdate': ('projects_statusupdate_fts', ['admin_message']),
+}
+
+TEXT_SEARCH_CONFIG = 'english'
+
+
+def _sqlite_install_statements(table, fts_table, columns):
+    cols = ', '.join(columns)
+    new_cols = ', '.join(f'new.{c}' for c in columns)
+    old_cols = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+    ]
+
+
+def _sqlite_uninstall_statements(fts_table):
+    return [
+        f"DROP TRIGGER IF EXISTS {fts_table}_ai",
+        f"DROP TRIGGER IF EXISTS {fts_table}_ad",
+        f"DROP TRIGGER IF EXISTS {fts_table}_au",
+        f"DROP TABLE IF EXISTS {fts_table}",
+    ]
+
+
+def _tsvector_sql(columns, table=None):
+    prefix = f'"{table}".' if table else ''
+    document = " || ' ' || ".join(f"coalesce({prefix}\"{c}\", '')" for c in columns)
+    return f"to_tsvector('{TEXT_SEARCH_CONFIG}', {document})"
+
+
+def install_search_indexes(schema_editor):
+    """Create the full-text indexes for the current database (used by migrations)"""
+    vendor = schema_editor.connection.vendor
+    for table, (index_name, columns) in SEARCH_INDEXES.items():
+        if vendor == 'sqlite':
+            try:
+                for statement in _sqlite_install_statements(table, index_name, columns):
+                    schema_editor.execute(statement)
+            except DatabaseError as e:
+                # SQLite built without FTS5: admin search falls back to LIKE
+                logger.warning(f"FTS5 unavailable, skipping {index_name}: {e}")
+                return
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON "{table}" USING GIN ({_tsvector_sql(columns)})'
+            )
+
+
+def uninstall_search_indexes(schema_editor):
+    """Drop the full-text indexes (used by migrations)"""
+    vendor = schema_editor.connection.vendor
+    for table, (index_name, columns) in SEARCH_INDEXES.items():
+        if vendor == 'sqlite':
+            for statement in _sqlite_uninstall_statements(index_name):
+                schema_editor.execute(statement)
+        elif vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}')
+
+
+def _fts5_query(search_term):
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix"""
+    words = re.findall(r'\w+', search_term)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+_sqlite_fts_tables = {}
+
+
+def _sqlite_has_fts(fts_table):
+    """Whether the FTS5 table exists (looked up once per database file)"""
+    name = str(connection.settings_dict['NAME'])
+    if name not in _sqlite_fts_tables:
+        _sqlite_fts_tables[name] = set(connection.introspection.table_names())
+    return fts_table in _sqlite_fts_tables[name]
+
+
+def match_condition(model, search_term):
+    """
+    Build a (filter Q, rank expression) pair matching `search_term` on `model`
+
+    Returns:
+        tuple: (Q, expression) or None if full-text search is unavailable
+    """
+    table = model._meta.db_table
+    if table not in SEARCH_INDEXES:
+        return None
+    index_name, columns = SEARCH_INDEXES[table]
+
+    if connection.vendor == 'sqlite':
+        if not _sqlite_has_fts(index_name):
+            return None
+        query = _fts5_query(search_term)
+        if not query:
+            return None
+        matches = RawSQL(f"SELECT rowid FROM {index_name} WHERE {index_name} MATCH %s", [query])
+        # bm25() is lower for better matches, so negate it for a "higher is better" rank
+        rank = RawSQL(
+            f'SELECT -bm25({index_name}) FROM {index_name} WHERE {index_name} MATCH %s AND rowid = "{table}"."id"',
+            [query],
+            output_field=FloatField(),
+        )
+        return Q(pk__in=matches), rank
+
+    if connection.vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+        matches = RawSQL(f'SELECT "id" FROM "{table}" WHERE {_tsvector_sql(columns)} @@ {tsquery}', [search_term])
+        rank = RawSQL(f'ts_rank({_tsvector_sql(columns, table)}, {tsquery})', [search_term], output_field=FloatField())
+        return Q(pk__in=matches), rank
+
+    return None
+
+
+class FullTextSearchMixin:
+    """
+    ModelAdmin mixin that answers the changelist search box from the
+    full-text index, ordered by relevance unless a column sort is chosen
+
+    `full_text_related` lists foreign keys whose targets are searched too
+    (e.g. a StatusUpdate matches when its request's business name does).
+    """
+
+    full_text_related = []
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+
+        own = match_condition(queryset.model, search_term)
+        if own is None:
+            return super().get_search_results(request, queryset, search_term)
+
+        condition, rank = own
+        for field_name in self.full_text_related:
+            related_model = queryset.model._meta.get_field(field_name).related_model
+            related = match_condition(related_model, search_term)
+            if related is not None:
+                condition |= Q(**{f'{field_name}__in': related_model.objects.filter(related[0]).values('pk')})
+
+        queryset = queryset.filter(condition).annotate(search_rank=Coalesce(rank, 0.0, output_field=FloatField()))
+        if ORDER_VAR not in request.GET:
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset, False
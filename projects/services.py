@@ -3,15 +3,90 @@ Email services for Arka
 Handles all email notifications in a reusable, maintainable way
 """
 
+import hashlib
 import logging
-from django.core.mail import send_mail
+import os
+import queue
+import re
+import threading
+import time
+from datetime import timedelta
+from django.core.mail import EmailMessage
 from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Min, Q
 from django.utils import timezone
 
+from .models import EmailOutbox, AdminDigestEntry, StatusUpdate, WebsiteRequest, STATUS_CHOICES
+from .metrics import send_with_metrics
+from .db import retry_on_locked
+
 logger = logging.getLogger(__name__)
 
 
-def send_admin_email(subject, message, recipient=None):
+def content_hash(from_email, recipients, subject, body):
+    """Stable hash identifying an email's content (for duplicate suppression)"""
+    payload = '\x1f'.join([from_email, ','.join(sorted(recipients)), subject, body])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@retry_on_locked
+def queue_email(subject, message, recipient_list, from_email=None, template=''):
+    """
+    Write an email to the outbox so the email worker can deliver it
+    
+    The row is committed together with the caller's transaction, so the
+    request never waits on the SMTP server. With EMAIL_DISPATCH_MODE='thread'
+    the row is also handed to this process's EmailDispatcher after commit. An identical email (same sender,
+    recipients, subject and body) queued within NOTIFICATION_DEDUPE_SECONDS is
+    not queued again, e.g. the confirmation for a double-submitted form.
+    
+    Args:
+        subject (str): Email subject
+        message (str): Email body (plain text)
+        recipient_list (list): Recipient email addresses
+        from_email (str): Optional sender (defaults to DEFAULT_FROM_EMAIL)
+        template (str): Kind of email, for per-template metrics
+    
+    Returns:
+        EmailOutbox: The queued outbox row (or the earlier identical one)
+    """
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    recipients = list(recipient_list)
+    digest = content_hash(from_email, recipients, subject, message)
+    with transaction.atomic():
+        # The check and the insert must not interleave with another writer of the same
+        # email. SQLite connections open IMMEDIATE transactions, which already hold the
+        # write lock; PostgreSQL can't lock a row that doesn't exist yet, so take an
+        # advisory lock on the hash instead.
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(hashtextextended(%s, 0))', [digest])
+        since = timezone.now() - timedelta(seconds=settings.NOTIFICATION_DEDUPE_SECONDS)
+        duplicate = (
+            EmailOutbox.objects.filter(content_hash=digest, created_at__gte=since)
+            .exclude(status='dead')
+            .first()
+        )
+        if duplicate is not None:
+            logger.info(f"Duplicate email suppressed (matches outbox {duplicate.pk}): {subject}")
+            return duplicate
+        
+        outbox_email = EmailOutbox.objects.create(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            recipients=recipients,
+            content_hash=digest,
+            template=template,
+        )
+        if settings.EMAIL_DISPATCH_MODE == 'thread':
+            # Only hand the row over once it is visible to the sending threads
+            transaction.on_commit(lambda: get_dispatcher().submit(outbox_email.pk))
+    return outbox_email
+
+
+def send_admin_email(subject, message, recipient=None, template='admin_notification'):
     """
     Send an email to admin with specified content
     
@@ -19,6 +94,7 @@ def send_admin_email(subject, message, recipient=None):
         subject (str): Email subject
         message (str): Email body (plain text)
         recipient (str): Optional recipient email (defaults to ADMIN_EMAIL from settings)
+        template (str): Kind of email, for per-template metrics
     
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -27,17 +103,11 @@ def send_admin_email(subject, message, recipient=None):
         recipient = settings.ADMIN_EMAIL
     
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[recipient],
-            fail_silently=False,
-        )
-        logger.info(f"Email sent successfully to {recipient}: {subject}")
+        queue_email(subject, message, [recipient], template=template)
+        logger.info(f"Email queued for {recipient}: {subject}")
         return True
     except Exception as e:
-        logger.error(f"Failed to send email to {recipient}: {str(e)}")
+        logger.error(f"Failed to queue email to {recipient}: {str(e)}")
         return False
 
 
@@ -71,10 +141,12 @@ To reply, use the sender's email: {email}
     """.strip()
     
     subject = "New Contact Message – Arka"
-    return send_admin_email(subject, formatted_message)
+    if settings.ADMIN_EMAIL_DIGEST_ENABLED:
+        return add_to_admin_digest('contact', subject, formatted_message)
+    return send_admin_email(subject, formatted_message, template='contact_admin')
 
 
-def send_website_request_email(business_name, email, website_type, description, budget=None, is_logged_in=False, user_info=None):
+def send_website_request_email(business_name, email, website_type, description, budget=None, is_logged_in=False, user_info=None, immediate=False):
     """
     Send website request submission to admin
     
@@ -86,6 +158,7 @@ def send_website_request_email(business_name, email, website_type, description,
         budget (str): Budget (optional)
         is_logged_in (bool): Whether user is logged in
         user_info (str): Additional user info if logged in
+        immediate (bool): Bypass the admin digest and notify right away
     
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -121,7 +194,104 @@ Check the admin dashboard for more details and to track progress.
     """.strip()
     
     subject = "New Website Request Received – Arka"
-    return send_admin_email(subject, formatted_message)
+    if settings.ADMIN_EMAIL_DIGEST_ENABLED and not (immediate or is_high_budget(budget)):
+        return add_to_admin_digest('website_request', subject, formatted_message)
+    return send_admin_email(subject, formatted_message, template='website_request_admin')
+
+
+def parse_budget(budget):
+    """
+    Best-effort upper bound of a free-text budget such as "$500-$1000" or "5k"
+    
+    Returns:
+        float: Largest amount mentioned, or None if no amount was found
+    """
+    if not budget:
+        return None
+    amounts = []
+    for number, suffix in re.findall(r'(\d[\d,]*(?:\.\d+)?)\s*([kK]?)', budget):
+        amount = float(number.replace(',', ''))
+        amounts.append(amount * 1000 if suffix else amount)
+    return max(amounts) if amounts else None
+
+
+def is_high_budget(budget):
+    """Whether a request's budget qualifies for an immediate admin email"""
+    threshold = settings.ADMIN_EMAIL_DIGEST_IMMEDIATE_BUDGET
+    amount = parse_budget(budget)
+    return bool(threshold) and amount is not None and amount >= threshold
+
+
+def add_to_admin_digest(kind, subject, message):
+    """
+    Hold an admin notification for the next digest email
+    
+    Args:
+        kind (str): 'website_request' or 'contact'
+        subject (str): Original email subject
+        message (str): Original email body
+    
+    Returns:
+        bool: True if the entry was stored, False otherwise
+    """
+    try:
+        retry_on_locked(AdminDigestEntry.objects.create)(kind=kind, subject=subject, body=message)
+        logger.info(f"Admin notification added to digest: {subject}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to add admin notification to digest: {str(e)}")
+        return False
+
+
+def flush_admin_digest(force=False):
+    """
+    Send pending digest entries to the admin as one summary email
+    
+    Entries are held until the oldest one has waited
+    ADMIN_EMAIL_DIGEST_WINDOW_MINUTES, so each window produces one email.
+    
+    Args:
+        force (bool): Send whatever is pending without waiting for the window
+    
+    Returns:
+        int: Number of entries included in the digest (0 if nothing was sent)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        pending = AdminDigestEntry.objects.select_for_update().filter(digested_at__isnull=True)
+        oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+        if oldest is None:
+            return 0
+        if not force and oldest > now - timedelta(minutes=settings.ADMIN_EMAIL_DIGEST_WINDOW_MINUTES):
+            return 0
+        
+        entries = list(pending.order_by('created_at'))
+        request_count = sum(1 for entry in entries if entry.kind == 'website_request')
+        contact_count = len(entries) - request_count
+        
+        sections = [
+            f"========== {index}. {entry.subject} ==========\n{entry.body}"
+            for index, entry in enumerate(entries, start=1)
+        ]
+        message = f"""
+Arka Admin Digest – {len(entries)} new item(s)
+
+---------- SUMMARY ----------
+Period:            {timezone.localtime(entries[0].created_at).strftime('%Y-%m-%d %H:%M')} to {timezone.localtime(entries[-1].created_at).strftime('%Y-%m-%d %H:%M')}
+Website requests:  {request_count}
+Contact messages:  {contact_count}
+
+{chr(10).join(sections)}
+
+---------- END DIGEST ----------
+        """.strip()
+        
+        subject = f"Arka Digest: {request_count} new request(s), {contact_count} message(s)"
+        queue_email(subject, message, [settings.ADMIN_EMAIL], template='admin_digest')
+        AdminDigestEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(digested_at=now)
+    
+    logger.info(f"Admin digest queued with {len(entries)} entries")
+    return len(entries)
 
 
 def send_website_request_confirmation(email, business_name):
@@ -156,15 +326,518 @@ P.S. Keep an eye on your email for our follow-up!
     subject = "Your Website Request Received – Arka"
     
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
-        logger.info(f"Confirmation email sent to {email}")
+        queue_email(subject, message, [email], template='request_confirmation')
+        logger.info(f"Confirmation email queued for {email}")
         return True
     except Exception as e:
-        logger.error(f"Failed to send confirmation email to {email}: {str(e)}")
+        logger.error(f"Failed to queue confirmation email to {email}: {str(e)}")
         return False
+
+
+def send_website_request_notifications(website_request, user):
+    """
+    Queue the admin notification and client confirmation for a new request
+    
+    Args:
+        website_request (WebsiteRequest): The saved request
+        user (User): The logged-in user who owns the request
+    """
+    user_info = f"{user.first_name} {user.last_name}".strip() or user.username
+    send_website_request_email(
+        business_name=website_request.business_name,
+        email=website_request.email,
+        website_type=website_request.get_website_type_display(),
+        description=website_request.description,
+        budget=website_request.budget,
+        is_logged_in=True,
+        user_info=user_info
+    )
+    send_website_request_confirmation(website_request.email, website_request.business_name)
+
+
+def _retry_delay(attempts):
+    """Exponential backoff delay after the given number of failed attempts"""
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_outbox_emails(limit=50):
+    """
+    Claim up to `limit` due outbox rows for delivery
+    
+    Rows are claimed with a conditional UPDATE so several workers can drain
+    the outbox at once. A claimed row gets a lease; if the worker dies while
+    sending, the row becomes due again once the lease runs out.
+    
+    Returns:
+        list: Claimed EmailOutbox rows
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    due = Q(status='pending') | Q(status='sending')
+    candidate_ids = list(
+        EmailOutbox.objects.filter(due, next_attempt_at__lte=now)
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+    
+    claimed = [pk for pk in candidate_ids if _claim_outbox_row(pk, now, lease_until)]
+    return list(EmailOutbox.objects.filter(pk__in=claimed).order_by('next_attempt_at', 'pk'))
+
+
+def _claim_outbox_row(pk, now, lease_until):
+    """Lease one due outbox row; False if it is not due or another sender won it"""
+    due = Q(status='pending') | Q(status='sending')
+    return bool(EmailOutbox.objects.filter(due, pk=pk, next_attempt_at__lte=now).update(
+        status='sending',
+        attempts=F('attempts') + 1,
+        next_attempt_at=lease_until,
+    ))
+
+
+def deliver_outbox_email(outbox_email):
+    """
+    Send one claimed outbox row over a pooled SMTP connection and record the outcome
+    (on the row, and as an EmailSendMetric)
+    
+    Failed rows are rescheduled with exponential backoff until
+    EMAIL_OUTBOX_MAX_ATTEMPTS is reached, then moved to the dead-letter state.
+    
+    Returns:
+        bool: True if the email was sent, False otherwise
+    """
+    message = EmailMessage(
+        subject=outbox_email.subject,
+        body=outbox_email.body,
+        from_email=outbox_email.from_email,
+        to=outbox_email.recipients,
+    )
+    try:
+        send_with_metrics(message, outbox_email.template)
+    except Exception as e:
+        outbox_email.last_error = f"{e.__class__.__name__}: {e}"
+        if outbox_email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            outbox_email.status = 'dead'
+            logger.error(f"Email {outbox_email.pk} moved to dead letter after {outbox_email.attempts} attempts: {e}")
+        else:
+            outbox_email.status = 'pending'
+            outbox_email.next_attempt_at = timezone.now() + _retry_delay(outbox_email.attempts)
+            logger.warning(f"Email {outbox_email.pk} failed (attempt {outbox_email.attempts}), retrying at {outbox_email.next_attempt_at}: {e}")
+        outbox_email.save(update_fields=['status', 'next_attempt_at', 'last_error'])
+        return False
+    
+    outbox_email.status = 'sent'
+    outbox_email.sent_at = timezone.now()
+    outbox_email.last_error = ''
+    outbox_email.save(update_fields=['status', 'sent_at', 'last_error'])
+    logger.info(f"Email {outbox_email.pk} sent to {', '.join(outbox_email.recipients)}: {outbox_email.subject}")
+    return True
+
+
+def drain_outbox(batch_size=50):
+    """
+    Deliver one batch of due outbox emails (connections come from the SMTP pool)
+    
+    Returns:
+        tuple: (sent, failed) counts for the batch
+    """
+    batch = claim_outbox_emails(limit=batch_size)
+    if not batch:
+        return 0, 0
+    
+    sent = failed = 0
+    for outbox_email in batch:
+        if deliver_outbox_email(outbox_email):
+            sent += 1
+        else:
+            failed += 1
+    return sent, failed
+
+
+def build_status_email(status_update, old_status=None):
+    """
+    Render the client email for a status change
+    
+    Args:
+        status_update (StatusUpdate): The (latest) change, with its request loaded
+        old_status (str): Status to report as the previous one (defaults to the update's own)
+    
+    Returns:
+        EmailMessage: Ready to send
+    """
+    website_request = status_update.request
+    labels = dict(STATUS_CHOICES)
+    emojis = {
+        'new': '🆕',
+        'contacted': '📞',
+        'in_progress': '⚙️',
+        'completed': '✅',
+    }
+    old_status = old_status or status_update.old_status
+    old_label = labels.get(old_status, old_status)
+    new_label = labels.get(status_update.new_status, status_update.new_status)
+    message = f"""
+Hi {website_request.business_name},
+
+Your website request status has been updated!
+
+OLD STATUS: {old_label}
+NEW STATUS: {emojis.get(status_update.new_status, '•')} {new_label}
+
+NOTES FROM OUR TEAM:
+{status_update.admin_message or 'Your request is being processed.'}
+
+View your full request details here:
+http://127.0.0.1:8000/dashboard/
+
+Best regards,
+Arka Team ✨
+    """.strip()
+    
+    subject = f"Update: Your {website_request.business_name} Website Request - {new_label}"
+    return EmailMessage(subject, message, 'noreply@arka.com', [website_request.email])
+
+
+def _pending_status_updates(now):
+    """Unnotified updates that are due and have attempts left"""
+    return StatusUpdate.objects.filter(
+        Q(notify_after__isnull=True) | Q(notify_after__lte=now),
+        notified=False,
+        notify_attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def _settled_request_ids(now, limit):
+    """
+    Requests with pending updates, none newer than NOTIFICATION_COALESCE_SECONDS
+    
+    A request still being clicked through (new → contacted → in_progress)
+    waits until its changes settle, then all of them go out as one email.
+    """
+    cutoff = now - timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS)
+    settling = StatusUpdate.objects.filter(notified=False, created_at__gt=cutoff).values('request_id')
+    return list(
+        _pending_status_updates(now)
+        .exclude(request_id__in=settling)
+        .values('request_id')
+        .annotate(first_created=Min('created_at'))
+        .order_by('first_created')
+        .values_list('request_id', flat=True)[:limit]
+    )
+
+
+def claim_status_updates(limit=50):
+    """
+    Claim the pending status updates of up to `limit` requests whose changes have settled
+    
+    On databases with SKIP LOCKED (PostgreSQL) rows are picked with
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never wait on or
+    double-claim each other's rows. Elsewhere (SQLite) each request's rows are
+    claimed with one conditional UPDATE. Either way the claim sets a lease in
+    notify_after: the email is sent outside any transaction, and if the worker
+    dies the rows are claimed again once the lease runs out.
+    
+    Returns:
+        list: Claimed StatusUpdate rows with their requests loaded, oldest first
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    request_ids = _settled_request_ids(now, limit)
+    if not request_ids:
+        return []
+    
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            claimed = list(
+                _pending_status_updates(now)
+                .filter(request_id__in=request_ids)
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)
+            )
+            StatusUpdate.objects.filter(pk__in=claimed).update(
+                notify_attempts=F('notify_attempts') + 1,
+                notify_after=lease_until,
+            )
+        claimed_rows = Q(pk__in=claimed)
+    else:
+        claimed_requests = [
+            request_id for request_id in request_ids
+            if _pending_status_updates(now).filter(request_id=request_id).update(
+                notify_attempts=F('notify_attempts') + 1,
+                notify_after=lease_until,
+            )
+        ]
+        claimed_rows = Q(request_id__in=claimed_requests, notified=False, notify_after=lease_until)
+    
+    return list(StatusUpdate.objects.filter(claimed_rows).select_related('request').order_by('created_at', 'pk'))
+
+
+def deliver_status_updates(status_updates):
+    """
+    Email the client one message covering a request's claimed status updates
+    
+    The email reports the status before the first update and after the last
+    one, with the latest notes. Nothing is sent when the changes cancel out
+    (e.g. new → contacted → new) or when the same email already went to the
+    client within NOTIFICATION_DEDUPE_SECONDS; the updates are still marked
+    as handled. Failures are retried with the outbox backoff until
+    EMAIL_OUTBOX_MAX_ATTEMPTS, after which the updates keep their last error.
+    
+    Args:
+        status_updates (list): Claimed updates of one request, oldest first
+    
+    Returns:
+        bool: True if the updates were handled, False if sending failed
+    """
+    first, latest = status_updates[0], status_updates[-1]
+    pks = [update.pk for update in status_updates]
+    now = timezone.now()
+    message = build_status_email(latest, old_status=first.old_status)
+    digest = content_hash(message.from_email, message.to, message.subject, message.body)
+    
+    if first.old_status == latest.new_status:
+        skip_reason = 'changes cancelled out'
+    elif StatusUpdate.objects.filter(
+        request_id=latest.request_id, notified=True, notify_hash=digest,
+        notified_at__gte=now - timedelta(seconds=settings.NOTIFICATION_DEDUPE_SECONDS),
+    ).exists():
+        skip_reason = 'identical email already sent'
+    else:
+        skip_reason = None
+        try:
+            send_with_metrics(message, 'status_update')
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            attempts = max(update.notify_attempts for update in status_updates)
+            if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                retry_at = None
+                logger.error(f"Status updates {pks} not notified after {attempts} attempts: {e}")
+            else:
+                retry_at = now + _retry_delay(attempts)
+                logger.warning(f"Status updates {pks} email failed (attempt {attempts}), retrying at {retry_at}: {e}")
+            StatusUpdate.objects.filter(pk__in=pks).update(notify_after=retry_at, notify_error=error)
+            return False
+    
+    StatusUpdate.objects.filter(pk__in=pks).update(
+        notified=True,
+        notified_at=now,
+        notify_after=None,
+        notify_error='',
+        notify_hash=digest,
+    )
+    if skip_reason:
+        logger.info(f"Status updates {pks} for request {latest.request_id} not emailed: {skip_reason}")
+        return True
+    
+    WebsiteRequest.objects.filter(pk=latest.request_id).update(notified_user=True)
+    logger.info(f"Status updates {pks} emailed to {latest.request.email} as one message")
+    return True
+
+
+def notify_status_updates(batch_size=50):
+    """
+    Send pending status-change emails for up to `batch_size` requests
+    
+    Each request's updates are coalesced into one email (keyed by request,
+    and so by its client's address). The batch goes out back to back through
+    the SMTP pool, which keeps reusing the same open connection.
+    
+    Returns:
+        tuple: (handled, failed) request counts for the batch
+    """
+    groups = {}
+    for status_update in claim_status_updates(limit=batch_size):
+        groups.setdefault(status_update.request_id, []).append(status_update)
+    
+    handled = failed = 0
+    for status_updates in groups.values():
+        if deliver_status_updates(status_updates):
+            handled += 1
+        else:
+            failed += 1
+    return handled, failed
+
+
+_STOP = object()
+
+
+class EmailDispatcher:
+    """
+    Bounded in-process email sender for deployments without run_email_worker
+    
+    Emails are still written to the outbox first; the dispatcher only delivers
+    them sooner. queue_email submits a row's id once the caller's transaction
+    commits and a few daemon threads claim and send it. When the queue is full
+    the id is not queued and the row simply waits in the outbox, so a burst
+    never blocks a request or grows memory. One thread also sweeps at start
+    and every EMAIL_DISPATCH_SWEEP_SECONDS like the worker does (spilled rows,
+    retries, status-change emails and the admin digest). Each web process runs
+    its own sweeper; rows are claimed with conditional updates, so concurrent
+    sweepers never send the same email twice.
+    """
+    
+    def __init__(self, max_workers=2, queue_size=100, sweep_seconds=30):
+        self.max_workers = max_workers
+        self.sweep_seconds = sweep_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._closed = False
+    
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_workers=settings.EMAIL_DISPATCH_THREADS,
+            queue_size=settings.EMAIL_DISPATCH_QUEUE_SIZE,
+            sweep_seconds=settings.EMAIL_DISPATCH_SWEEP_SECONDS,
+        )
+    
+    def start(self):
+        """Start the sending threads; returns self for chaining"""
+        for index in range(self.max_workers):
+            sweeper = index == 0 and self.sweep_seconds > 0
+            thread = threading.Thread(target=self._run, args=(sweeper,), name=f'email-dispatch-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+    
+    def submit(self, outbox_id):
+        """
+        Queue an outbox row for sending without blocking
+        
+        Returns:
+            bool: True if queued, False if the dispatcher is full or shut down
+            (the row stays pending in the outbox either way)
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(outbox_id)
+        except queue.Full:
+            logger.warning(f"Email dispatcher full, email {outbox_id} left in the outbox")
+            return False
+        return True
+    
+    def deliver(self, outbox_id):
+        """Claim and send one outbox row (skipped if it was sent or claimed elsewhere)"""
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+        if _claim_outbox_row(outbox_id, now, lease_until):
+            deliver_outbox_email(EmailOutbox.objects.get(pk=outbox_id))
+    
+    def sweep(self):
+        """One pass of the email worker's loop"""
+        flush_admin_digest()
+        notify_status_updates()
+        drain_outbox()
+    
+    def _work(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Email dispatcher error in {func.__name__}: {e}")
+        finally:
+            close_old_connections()
+    
+    def _run(self, sweeper):
+        next_sweep = time.monotonic()  # sweep right away: a restarted process may have work waiting
+        try:
+            while True:
+                timeout = max(0, next_sweep - time.monotonic()) if sweeper else None
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if item is not None:
+                    self._work(self.deliver, item)
+                if sweeper and time.monotonic() >= next_sweep:
+                    self._work(self.sweep)
+                    next_sweep = time.monotonic() + self.sweep_seconds
+        finally:
+            connection.close()
+    
+    def shutdown(self, timeout=10):
+        """
+        Stop accepting emails and send what is already queued, for up to `timeout` seconds
+        
+        Emails not sent by the deadline stay pending in the outbox for the
+        next sweep or worker.
+        
+        Returns:
+            int: Emails still queued when the deadline passed
+        """
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        for _ in self._threads:
+            try:
+                self._queue.put(_STOP, timeout=max(0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        
+        if not any(thread.is_alive() for thread in self._threads):
+            # Nobody left to send: deliver the rest from the calling thread
+            while time.monotonic() < deadline:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    self._work(self.deliver, item)
+        
+        left = sum(1 for item in list(self._queue.queue) if item is not _STOP)
+        if left:
+            logger.warning(f"Email dispatcher stopped with {left} email(s) left in the outbox")
+        return left
+
+
+_dispatcher = None
+_dispatcher_pid = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    """Return this process's running EmailDispatcher (recreated after fork)"""
+    global _dispatcher, _dispatcher_pid
+    pid = os.getpid()
+    if _dispatcher is None or _dispatcher_pid != pid:
+        with _dispatcher_lock:
+            if _dispatcher is None or _dispatcher_pid != pid:
+                _dispatcher = EmailDispatcher.from_settings().start()
+                _dispatcher_pid = pid
+    return _dispatcher
+
+
+def start_dispatcher():
+    """
+    Start this process's dispatcher when EMAIL_DISPATCH_MODE='thread' (gunicorn post_worker_init)
+    
+    Started at boot rather than by the first queued email, so status-change
+    emails, the admin digest and retries go out even if the process never
+    queues an email itself.
+    
+    Returns:
+        EmailDispatcher: The running dispatcher, or None in 'worker' mode
+    """
+    if settings.EMAIL_DISPATCH_MODE != 'thread':
+        return None
+    return get_dispatcher()
+
+
+def shutdown_dispatcher(timeout=None):
+    """
+    Flush and stop this process's dispatcher, if one was started (gunicorn worker_exit)
+    
+    Returns:
+        int: Emails left in the outbox unsent
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is None or _dispatcher_pid != os.getpid():
+        return 0
+    if timeout is None:
+        timeout = settings.EMAIL_DISPATCH_SHUTDOWN_TIMEOUT
+    return dispatcher.shutdown(timeout)
@@ -0,0 +1,18 @@
+"""
+Signal handlers for the projects app
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import WebsiteRequest
+from .page_cache import invalidate_page_cache
+from .stats import invalidate_request_stats
+
+
+@receiver(post_save, sender=WebsiteRequest)
+@receiver(post_delete, sender=WebsiteRequest)
+def website_request_changed(sender, **kwargs):
+    """Keep the cached stats and anonymous pages in sync with WebsiteRequest writes"""
+    invalidate_request_stats()
+    invalidate_page_cache()
@@ -0,0 +1,205 @@
+"""
+SMTP connection pool for Arka
+Reuses authenticated SMTP connections across sends instead of paying the
+TCP connect, TLS handshake and AUTH cost for every email
+"""
+
+import atexit
+import logging
+import os
+import smtplib
+import socket
+import threading
+import time
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection itself is unusable. A rejected recipient or
+# message (SMTPResponseException: 451, 550, ...) is not one of them: smtplib
+# sends RSET after a failed DATA, so the session stays usable and is kept.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
+
+
+class PooledConnection:
+    """An open email backend plus the bookkeeping the pool needs"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages_sent = 0
+
+    def idle_for(self):
+        return time.monotonic() - self.last_used
+
+    def is_alive(self):
+        """Check an SMTP session with NOOP; non-SMTP backends are always alive"""
+        smtp = getattr(self.backend, 'connection', None)
+        if not isinstance(smtp, smtplib.SMTP):
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        try:
+            self.backend.close()
+        except Exception:
+            pass
+
+
+class SMTPConnectionPool:
+    """
+    Per-process pool of open email backend connections
+
+    - Idle connections are kept open and reused (keep-alive)
+    - Connections idle longer than `idle_timeout` are closed (idle eviction)
+    - A connection is retired after `max_messages` sends
+    - A connection idle longer than `keepalive_interval` is checked with NOOP
+      before reuse, and a send that fails on a dropped connection is retried
+      once on a fresh one (transparent reconnection)
+    """
+
+    def __init__(self, max_size=2, idle_timeout=60, max_messages=100, keepalive_interval=15):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.keepalive_interval = keepalive_interval
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_size=settings.EMAIL_POOL_MAX_SIZE,
+            idle_timeout=settings.EMAIL_POOL_IDLE_TIMEOUT,
+            max_messages=settings.EMAIL_POOL_MAX_MESSAGES,
+            keepalive_interval=settings.EMAIL_POOL_KEEPALIVE_INTERVAL,
+        )
+
+    def _evict_idle(self):
+        """Close idle connections past `idle_timeout` (caller holds the lock)"""
+        expired = [conn for conn in self._idle if conn.idle_for() > self.idle_timeout]
+        for conn in expired:
+            self._idle.remove(conn)
+            conn.close()
+
+    def acquire(self):
+        """Return an open PooledConnection, reusing an idle one when possible"""
+        with self._lock:
+            self._evict_idle()
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is not None and conn.idle_for() > self.keepalive_interval and not conn.is_alive():
+            logger.info("Discarding stale pooled SMTP connection")
+            conn.close()
+            conn = None
+
+        if conn is None:
+            backend = get_connection(fail_silently=False)
+            backend.open()
+            conn = PooledConnection(backend)
+        return conn
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, or close it if it should be retired"""
+        conn.last_used = time.monotonic()
+        if discard or conn.messages_sent >= self.max_messages:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def send_messages(self, email_messages):
+        """
+        Send EmailMessage objects over pooled connections
+
+        Returns:
+            int: Number of messages sent
+
+        Raises:
+            Exception: The send error of the first message that fails
+        """
+        sent = 0
+        for message in email_messages:
+            self.send_message(message)
+            sent += 1
+        return sent
+
+    def send_message(self, message):
+        """
+        Send a single EmailMessage, reconnecting once if a reused connection dropped
+
+        A message the server rejects is raised as is (not retried) and the
+        connection goes back to the pool.
+        """
+        conn = self.acquire()
+        reused = conn.messages_sent > 0
+        try:
+            conn.backend.send_messages([message])
+        except CONNECTION_ERRORS as e:
+            self.release(conn, discard=True)
+            if not reused:
+                raise
+            logger.info(f"Pooled SMTP connection dropped ({e}), reconnecting")
+            conn = self.acquire()
+            try:
+                conn.backend.send_messages([message])
+            except CONNECTION_ERRORS:
+                self.release(conn, discard=True)
+                raise
+            except Exception:
+                self.release(conn)
+                raise
+        except Exception:
+            self.release(conn)
+            raise
+        conn.messages_sent += 1
+        self.release(conn)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return this process's SMTP connection pool (recreated after fork)"""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = SMTPConnectionPool.from_settings()
+                _pool_pid = pid
+    return _pool
+
+
+def reset_pool():
+    """Close this process's pool and rebuild it from settings on next use (benchmarks, tests)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+def close_pool():
+    """Close all idle pooled connections (called at interpreter exit)"""
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close_all()
+
+
+atexit.register(close_pool)
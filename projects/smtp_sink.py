@@ -0,0 +1,145 @@
+"""
+In-process SMTP sink for Arka
+A small threaded SMTP server that accepts (and discards) mail, with
+configurable latency, failure rate and connection drops. Used by the
+benchmark_email command and `manage.py run_smtp_sink`, so email code can be
+exercised without sending anything to real mailboxes.
+"""
+
+import base64
+import logging
+import random
+import socketserver
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """One SMTP session: EHLO/HELO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def readline(self):
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionResetError('client closed the connection')
+        return line.decode('utf-8', errors='replace').rstrip('\r\n')
+
+    def delay(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def handle(self):
+        self.server.record('connections')
+        self.delay()
+        self.reply('220 arka-smtp-sink ready')
+        try:
+            while True:
+                line = self.readline()
+                command = line[:4].upper()
+                if self.server.drop_rate and random.random() < self.server.drop_rate:
+                    self.server.record('dropped')
+                    return  # hang up mid-session, like a server restart or idle timeout
+                if command in ('EHLO', 'HELO'):
+                    if command == 'EHLO':
+                        self.wfile.write(b'250-arka-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+                    else:
+                        self.reply('250 arka-smtp-sink')
+                elif command == 'AUTH':
+                    self.authenticate(line)
+                elif command in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                    self.reply('250 OK')
+                elif command == 'DATA':
+                    self.receive_data()
+                elif command == 'QUIT':
+                    self.reply('221 Bye')
+                    return
+                else:
+                    self.reply('502 Command not implemented')
+        except (ConnectionError, OSError):
+            return
+
+    def authenticate(self, line):
+        parts = line.split()
+        mechanism = parts[1].upper() if len(parts) > 1 else ''
+        if mechanism == 'PLAIN' and len(parts) < 3:
+            self.reply('334 ')
+            self.readline()
+        elif mechanism == 'LOGIN':
+            self.reply('334 ' + base64.b64encode(b'Username:').decode())
+            self.readline()
+            self.reply('334 ' + base64.b64encode(b'Password:').decode())
+            self.readline()
+        self.delay()
+        self.reply('235 Authentication successful')
+
+    def receive_data(self):
+        self.reply('354 End data with <CR><LF>.<CR><LF>')
+        size = 0
+        while True:
+            line = self.readline()
+            if line == '.':
+                break
+            size += len(line) + 2
+        self.delay()
+        if self.server.failure_rate and random.random() < self.server.failure_rate:
+            self.server.record('rejected')
+            self.reply('451 Temporary failure, try again later')
+            return
+        self.server.record('messages', size)
+        self.reply('250 Message accepted')
+
+
+class SMTPSinkServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded SMTP server discarding everything it accepts
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free one; see `port` after start())
+        latency (float): Seconds added before the greeting, AUTH and end-of-DATA replies
+        failure_rate (float): Share of messages rejected with a 451
+        drop_rate (float): Share of commands answered by closing the connection
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, failure_rate=0.0, drop_rate=0.0):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.stats = {'connections': 0, 'messages': 0, 'bytes': 0, 'rejected': 0, 'dropped': 0}
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record(self, event, size=0):
+        with self._stats_lock:
+            self.stats[event] += 1
+            self.stats['bytes'] += size
+
+    def start(self):
+        """Serve in a background thread; returns self for chaining"""
+        self._thread = threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,107 @@
+"""
+Request statistics for Arka's public pages
+One conditional aggregate, served from the cache with stale-while-revalidate
+"""
+
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count, Q
+
+from .models import ArchivedWebsiteRequest, WebsiteRequest
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'projects:request-stats'
+STATS_REFRESH_LOCK_KEY = 'projects:request-stats:refresh'
+STATS_VERSION_KEY = 'projects:request-stats:version'
+
+
+def compute_request_stats():
+    """
+    Count total, active and completed requests (one aggregate over the hot table,
+    plus the archive row count: archived requests are all completed)
+    
+    Returns:
+        dict: total_projects, active_projects, happy_clients
+    """
+    completed = Q(status='completed')
+    stats = WebsiteRequest.objects.aggregate(
+        total_projects=Count('pk'),
+        active_projects=Count('pk', filter=~completed),
+        happy_clients=Count('pk', filter=completed),
+    )
+    archived = ArchivedWebsiteRequest.objects.count()
+    stats['total_projects'] += archived
+    stats['happy_clients'] += archived
+    return stats
+
+
+def _store(stats, version):
+    """
+    Cache stats as fresh for STATS_CACHE_FRESH_SECONDS, servable stale for STATS_CACHE_STALE_SECONDS more
+    
+    `version` is the invalidation counter read before the stats were computed;
+    entries written with an older version are ignored on read, so a refresh
+    that started before invalidate_request_stats() cannot bring old counts back.
+    """
+    entry = {
+        'stats': stats,
+        'version': version,
+        'fresh_until': time.time() + settings.STATS_CACHE_FRESH_SECONDS,
+    }
+    cache.set(STATS_CACHE_KEY, entry, settings.STATS_CACHE_FRESH_SECONDS + settings.STATS_CACHE_STALE_SECONDS)
+
+
+def _refresh_in_background(version):
+    """Recompute stats off the request thread; only one refresh runs at a time"""
+    if not cache.add(STATS_REFRESH_LOCK_KEY, True, settings.STATS_CACHE_FRESH_SECONDS):
+        return
+    
+    def refresh():
+        try:
+            _store(compute_request_stats(), version)
+        except Exception as e:
+            logger.error(f"Failed to refresh request stats: {str(e)}")
+        finally:
+            cache.delete(STATS_REFRESH_LOCK_KEY)
+            close_old_connections()
+    
+    threading.Thread(target=refresh, name='request-stats-refresh', daemon=True).start()
+
+
+def get_request_stats():
+    """
+    Return cached request stats
+    
+    A fresh entry is returned as is. A stale entry is returned immediately
+    while a background thread recomputes it. Only a cache miss (first hit,
+    or an entry older than the last invalidation) queries synchronously.
+    
+    Returns:
+        dict: total_projects, active_projects, happy_clients
+    """
+    cached = cache.get_many([STATS_CACHE_KEY, STATS_VERSION_KEY])
+    entry = cached.get(STATS_CACHE_KEY)
+    version = cached.get(STATS_VERSION_KEY, 0)
+    if entry is None or entry.get('version') != version:
+        stats = compute_request_stats()
+        _store(stats, version)
+        return stats
+    
+    if entry['fresh_until'] < time.time():
+        _refresh_in_background(version)
+    return entry['stats']
+
+
+def invalidate_request_stats():
+    """Drop cached stats and bump the version so the next page view sees current counts"""
+    try:
+        cache.incr(STATS_VERSION_KEY)
+    except ValueError:
+        if not cache.add(STATS_VERSION_KEY, 1, None):
+            cache.incr(STATS_VERSION_KEY)
+    cache.delete(STATS_CACHE_KEY)
@@ -1,3 +1,823 @@
-from django.test import TestCase
+import csv
+import io
+import os
+import smtplib
+import runpy
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import warnings
+import time
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.contrib import admin
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.utils import timezone
+from accounts.models import User
+from .admin import StatusUpdateAdmin, WebsiteRequestAdmin
+from .archive import archive_batch, restore_archived_requests
+from .export import iter_csv
+from .metrics import classify_error, summarize
+from .models import (
+    AdminDigestEntry, ArchivedWebsiteRequest, EmailOutbox, EmailSendMetric, ImportCheckpoint, StatusUpdate, WebsiteRequest,
+)
+from .routers import PIN_COOKIE_NAME, PrimaryPinningMiddleware, ReplicaRouter, read_from_replica
+from .page_cache import CSRF_INPUT_RE, CSRF_PLACEHOLDER
+from .stats import STATS_VERSION_KEY, _store, get_request_stats, invalidate_request_stats
+from .services import (
+    EmailDispatcher, claim_status_updates, flush_admin_digest, parse_budget, send_contact_form_email,
+    queue_email, send_website_request_email, shutdown_dispatcher, start_dispatcher, drain_outbox, notify_status_updates,
+    send_website_request_confirmation,
+)
+from .smtp_pool import SMTPConnectionPool, reset_pool
+from .smtp_sink import SMTPSinkServer
 
-# Create your tests here.
+
+class QueryPlanIndexTests(TestCase):
+    """Check that the hot queries are served by the indexes added in 0008_query_indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('client', password='secret123')
+        for i in range(5):
+            website_request = WebsiteRequest.objects.create(
+                user=cls.user,
+                business_name=f'Business {i}',
+                email=f'client{i}@example.com',
+                status='completed' if i % 2 else 'new',
+            )
+            StatusUpdate.objects.create(request=website_request, old_status='new', new_status='contacted')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        if connection.vendor == 'sqlite':
+            self.assertIn(f'INDEX {index_name}', plan)
+        else:
+            self.assertIn(index_name, plan)
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_dashboard_requests_use_user_index(self):
+        self.assertUsesIndex(self.user.website_requests.all(), 'request_user_created_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_status_filter_uses_status_index(self):
+        self.assertUsesIndex(WebsiteRequest.objects.filter(status='new'), 'request_status_created_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_website_type_filter_uses_type_index(self):
+        self.assertUsesIndex(WebsiteRequest.objects.filter(website_type='blog'), 'request_type_created_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_email_lookup_uses_email_index(self):
+        self.assertUsesIndex(WebsiteRequest.objects.filter(email='client1@example.com'), 'request_email_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_open_requests_use_partial_index(self):
+        self.assertUsesIndex(WebsiteRequest.objects.exclude(status='completed'), 'request_open_created_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_status_timeline_uses_request_index(self):
+        website_request = self.user.website_requests.first()
+        self.assertUsesIndex(website_request.status_updates.all(), 'statusupdate_request_idx')
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_pending_notifications_use_partial_index(self):
+        self.assertUsesIndex(StatusUpdate.objects.filter(notified=False).order_by('created_at'), 'statusupdate_pending_idx')
+
+
+class DashboardConditionalGetTests(TestCase):
+    """The dashboard answers 304 until the user's requests or their status updates change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('client', password='secret123')
+        cls.website_request = WebsiteRequest.objects.create(
+            user=cls.user, business_name='Business', email='client@example.com',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_unchanged_dashboard_is_not_modified(self):
+        etag = self.client.get('/dashboard/')['ETag']
+        response = self.client.get('/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertTemplateNotUsed(response, 'dashboard.html')
+
+    def test_new_status_update_changes_etag(self):
+        etag = self.client.get('/dashboard/')['ETag']
+        StatusUpdate.objects.create(request=self.website_request, old_status='new', new_status='contacted')
+        response = self.client.get('/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_page(self):
+        self.assertNotEqual(self.client.get('/dashboard/')['ETag'], self.client.get('/dashboard/?page=2')['ETag'])
+
+    @override_settings(DASHBOARD_PAGE_SIZE=1)
+    def test_request_counts_cover_all_pages(self):
+        WebsiteRequest.objects.create(user=self.user, business_name='Second', email='client@example.com')
+        response = self.client.get('/dashboard/')
+        self.assertEqual(len(response.context['requests']), 1)
+        self.assertContains(response, '<h3>2</h3>', count=2)
+
+
+class RequestsAPITests(TestCase):
+    """JSON API: visibility, sparse fields and keyset pagination"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('client', password='secret123')
+        cls.other = User.objects.create_user('other', password='secret123')
+        cls.staff = User.objects.create_user('staff', password='secret123', is_staff=True)
+        for i in range(5):
+            WebsiteRequest.objects.create(user=cls.user, business_name=f'Mine {i}', email='client@example.com')
+        WebsiteRequest.objects.create(user=cls.other, business_name='Theirs', email='other@example.com')
+
+    def fetch_all(self, url):
+        names, cursor = [], None
+        while True:
+            response = self.client.get(url, {'limit': 2, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            names += [row['business_name'] for row in response.json()['results']]
+            cursor = response.json()['next_cursor']
+            if not cursor:
+                return names
+
+    def test_requires_login(self):
+        self.assertEqual(self.client.get('/api/v1/requests/').status_code, 401)
+
+    def test_client_pages_through_own_requests(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.fetch_all('/api/v1/requests/'), [f'Mine {i}' for i in reversed(range(5))])
+
+    def test_staff_filters(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/v1/requests/', {'email': 'other@example.com'})
+        self.assertEqual([row['business_name'] for row in response.json()['results']], ['Theirs'])
+
+    def test_staff_date_filters_are_validated(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/v1/requests/', {'created_after': '2024-13-01T00:00:00'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('created_after', response.json()['error'])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)  # naive datetimes warn under USE_TZ
+            response = self.client.get('/api/v1/requests/', {'created_after': '2000-01-01T00:00:00'})
+        self.assertEqual(len(response.json()['results']), WebsiteRequest.objects.count())
+
+    def test_sparse_fields(self):
+        self.client.force_login(self.user)
+        row = self.client.get('/api/v1/requests/').json()['results'][0]
+        self.assertNotIn('description', row)
+        row = self.client.get('/api/v1/requests/', {'fields': 'business_name,description'}).json()['results'][0]
+        self.assertEqual(set(row), {'id', 'business_name', 'description'})
+        self.assertEqual(self.client.get('/api/v1/requests/', {'fields': 'admin_notes'}).status_code, 400)
+
+    def test_other_users_request_is_hidden(self):
+        self.client.force_login(self.user)
+        theirs = WebsiteRequest.objects.get(business_name='Theirs')
+        self.assertEqual(self.client.get(f'/api/v1/requests/{theirs.pk}/').status_code, 404)
+
+    def test_create_validates_with_form(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/v1/requests/', {'business_name': 'New'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/v1/requests/', {
+            'business_name': 'New', 'website_type': 'blog', 'description': 'A blog', 'email': 'new@example.com',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['business_name'], 'New')
+
+
+class StatusNotificationWorkerTests(TestCase):
+    """Status changes are emailed by the worker once they settle, coalesced per request"""
+
+    def setUp(self):
+        self.website_request = WebsiteRequest.objects.create(business_name='Acme', email='client@example.com')
+
+    def add_update(self, old_status, new_status, seconds_ago=600):
+        update = StatusUpdate.objects.create(request=self.website_request, old_status=old_status, new_status=new_status)
+        StatusUpdate.objects.filter(pk=update.pk).update(created_at=timezone.now() - timedelta(seconds=seconds_ago))
+        return update
+
+    def test_pending_update_is_sent_once(self):
+        update = self.add_update('new', 'contacted')
+        self.assertEqual(notify_status_updates(), (1, 0))
+        self.assertEqual(notify_status_updates(), (0, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['client@example.com'])
+        update.refresh_from_db()
+        self.assertTrue(update.notified)
+
+    def test_claimed_update_is_leased(self):
+        self.add_update('new', 'contacted')
+        self.assertEqual(len(claim_status_updates()), 1)
+        self.assertEqual(claim_status_updates(), [])
+
+    def test_restored_request_does_not_resend_retired_updates(self):
+        update = self.add_update('new', 'completed', seconds_ago=90 * 86400)
+        StatusUpdate.objects.filter(pk=update.pk).update(
+            notify_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS, notify_error='Gave up',
+        )
+        WebsiteRequest.objects.filter(pk=self.website_request.pk).update(
+            status='completed', updated_at=timezone.now() - timedelta(days=90),
+        )
+        self.assertEqual(archive_batch(older_than_days=30, batch_size=10), 1)
+        self.assertEqual(restore_archived_requests(ArchivedWebsiteRequest.objects.all()), 1)
+
+        self.assertEqual(claim_status_updates(), [])
+        restored = StatusUpdate.objects.get(pk=update.pk)
+        self.assertEqual((restored.notify_attempts, restored.notify_error), (settings.EMAIL_OUTBOX_MAX_ATTEMPTS, 'Gave up'))
+
+    def test_changes_within_window_are_coalesced(self):
+        self.add_update('new', 'contacted', seconds_ago=200)
+        self.add_update('contacted', 'in_progress', seconds_ago=190)
+        self.assertEqual(notify_status_updates(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('OLD STATUS: 🆕 New', mail.outbox[0].body)
+        self.assertIn('In Progress', mail.outbox[0].subject)
+        self.assertFalse(StatusUpdate.objects.filter(notified=False).exists())
+
+    def test_request_waits_while_changes_are_recent(self):
+        self.add_update('new', 'contacted', seconds_ago=600)
+        self.add_update('contacted', 'in_progress', seconds_ago=5)
+        self.assertEqual(notify_status_updates(), (0, 0))
+
+    def test_cancelled_out_changes_send_nothing(self):
+        self.add_update('new', 'contacted')
+        self.add_update('contacted', 'new')
+        self.assertEqual(notify_status_updates(), (1, 0))
+        self.assertEqual(mail.outbox, [])
+
+
+class EmailDeduplicationTests(TestCase):
+    """Identical emails queued within the dedupe window are stored once"""
+
+    def test_double_submitted_confirmation_is_queued_once(self):
+        send_website_request_confirmation('client@example.com', 'Acme')
+        send_website_request_confirmation('client@example.com', 'Acme')
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    def test_different_recipients_are_not_deduplicated(self):
+        send_website_request_confirmation('client@example.com', 'Acme')
+        send_website_request_confirmation('other@example.com', 'Acme')
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+
+class EmailMetricsTests(TestCase):
+    """Every delivery attempt is recorded with its template and outcome"""
+
+    def test_outbox_delivery_is_recorded_per_template(self):
+        send_website_request_confirmation('client@example.com', 'Acme')
+        self.assertEqual(drain_outbox(), (1, 0))
+        metric = EmailSendMetric.objects.get()
+        self.assertEqual((metric.template, metric.outcome), ('request_confirmation', 'sent'))
+        self.assertEqual(summarize()['by_template'], {'request_confirmation': {'sent': 1}})
+
+    def test_errors_are_classified_by_exception(self):
+        self.assertEqual(classify_error(smtplib.SMTPAuthenticationError(535, b'no')), 'auth_error')
+        self.assertEqual(classify_error(socket.timeout()), 'timeout')
+        self.assertEqual(classify_error(smtplib.SMTPDataError(554, b'rejected')), 'smtp_error')
+
+
+class SMTPConnectionPoolTests(TestCase):
+    """Pooled SMTP connections against the local sink"""
+
+    def setUp(self):
+        self.sink = SMTPSinkServer().start()
+        self.addCleanup(self.sink.stop)
+        settings_override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.sink.port, EMAIL_USE_TLS=False, EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def send(self, pool, count=1):
+        for i in range(count):
+            pool.send_message(EmailMessage('Subject', 'Body', 'arka@example.com', [f'client{i}@example.com']))
+
+    def make_pool(self, **kwargs):
+        pool = SMTPConnectionPool(**kwargs)
+        self.addCleanup(pool.close_all)
+        return pool
+
+    def test_connection_is_reused(self):
+        self.send(self.make_pool(), 3)
+        self.assertEqual((self.sink.stats['connections'], self.sink.stats['messages']), (1, 3))
+
+    def test_connection_is_rotated_after_max_messages(self):
+        self.send(self.make_pool(max_messages=2), 3)
+        self.assertEqual((self.sink.stats['connections'], self.sink.stats['messages']), (2, 3))
+
+    def test_idle_connections_are_evicted(self):
+        pool = self.make_pool(idle_timeout=0)
+        self.send(pool)
+        time.sleep(0.01)
+        self.send(pool)
+        self.assertEqual(self.sink.stats['connections'], 2)
+
+    def test_dropped_connection_is_replaced_and_message_resent(self):
+        pool = self.make_pool(keepalive_interval=60)
+        self.send(pool)
+        pool._idle[0].backend.connection.sock.shutdown(socket.SHUT_RDWR)  # the connection dropped while idle
+        self.send(pool)
+        self.assertEqual((self.sink.stats['connections'], self.sink.stats['messages']), (2, 2))
+
+    def test_rejected_message_keeps_connection_and_is_not_retried(self):
+        pool = self.make_pool()
+        self.send(pool)
+        self.sink.failure_rate = 1.0
+        for _ in range(3):
+            with self.assertRaises(smtplib.SMTPDataError):
+                self.send(pool)
+        self.assertEqual((self.sink.stats['connections'], self.sink.stats['rejected']), (1, 3))
+        self.assertEqual(len(pool._idle), 1)
+
+
+class SMTPSinkTests(TestCase):
+    """The outbox delivers through the real SMTP backend to the local sink"""
+
+    def deliver_to(self, sink):
+        with override_settings(
+            EMAIL_BACKEND='projects.mail.InstrumentedSMTPBackend', EMAIL_HOST='127.0.0.1', EMAIL_PORT=sink.port,
+            EMAIL_USE_TLS=False, EMAIL_HOST_USER='sink', EMAIL_HOST_PASSWORD='sink',
+        ):
+            reset_pool()
+            try:
+                return drain_outbox()
+            finally:
+                reset_pool()
+
+    def test_sink_accepts_mail(self):
+        send_website_request_confirmation('client@example.com', 'Acme')
+        with SMTPSinkServer() as sink:
+            self.assertEqual(self.deliver_to(sink), (1, 0))
+        self.assertEqual(sink.stats['messages'], 1)
+        self.assertIsNotNone(EmailSendMetric.objects.get().auth_ms)
+
+    def test_rejected_mail_is_retried_later(self):
+        send_website_request_confirmation('client@example.com', 'Acme')
+        with SMTPSinkServer(failure_rate=1.0) as sink:
+            self.assertEqual(self.deliver_to(sink), (0, 1))
+        self.assertEqual(EmailOutbox.objects.get().status, 'pending')
+        self.assertEqual(EmailSendMetric.objects.get().outcome, 'smtp_error')
+
+
+@override_settings(EMAIL_DISPATCH_MODE='thread')
+class EmailDispatcherTests(TestCase):
+    """Committed outbox rows go to the in-process dispatcher; overflow stays in the outbox"""
+
+    def test_full_queue_spills_to_outbox_and_shutdown_flushes(self):
+        dispatcher = EmailDispatcher(max_workers=0, queue_size=1)  # no threads: shutdown sends inline
+        with mock.patch('projects.services.get_dispatcher', return_value=dispatcher):
+            with self.captureOnCommitCallbacks(execute=True):
+                send_website_request_confirmation('first@example.com', 'Acme')
+                send_website_request_confirmation('second@example.com', 'Globex')
+
+        self.assertEqual(dispatcher.shutdown(timeout=5), 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['first@example.com'])
+        spilled = EmailOutbox.objects.get(status='pending')
+        self.assertEqual(spilled.recipients, ['second@example.com'])
+        self.assertFalse(dispatcher.submit(spilled.pk))
+        self.assertEqual(drain_outbox(), (1, 0))
+
+
+class RequestStatsCacheTests(TestCase):
+    """A refresh that started before an invalidation cannot bring old counts back"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_refresh_started_before_invalidation_is_ignored(self):
+        user = User.objects.create_user('stats', password='pw-stats-123')
+        self.assertEqual(get_request_stats()['total_projects'], 0)
+        version = cache.get(STATS_VERSION_KEY, 0)  # what an in-flight refresh read
+
+        WebsiteRequest.objects.create(user=user, business_name='Acme', website_type='business', description='x', email='a@example.com')
+        invalidate_request_stats()
+        _store({'total_projects': 0, 'active_projects': 0, 'happy_clients': 0}, version)  # the refresh finishes late
+
+        self.assertEqual(get_request_stats()['total_projects'], 1)
+
+    def test_invalidation_reaches_other_processes(self):
+        get_request_stats()
+        version = cache.get(STATS_VERSION_KEY, 0)
+        # e.g. import_requests or another gunicorn worker
+        subprocess.run(
+            [sys.executable, 'manage.py', 'shell', '-c',
+             'from projects.stats import invalidate_request_stats; invalidate_request_stats()'],
+            cwd=settings.BASE_DIR, check=True, capture_output=True,
+        )
+        self.assertEqual(cache.get(STATS_VERSION_KEY, 0), version + 1)
+
+
+class AnonymousPageCacheTests(TestCase):
+    """Cached public pages get a fresh CSRF token per visitor and ignore query strings"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_hit_carries_a_working_csrf_token(self):
+        self.assertEqual(Client().get('/contact/')['X-Page-Cache'], 'MISS')
+
+        visitor = Client(enforce_csrf_checks=True)
+        response = visitor.get('/contact/')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        token = CSRF_INPUT_RE.search(response.content.decode()).group(1)
+        self.assertNotEqual(token, CSRF_PLACEHOLDER)
+
+        response = visitor.post('/contact/', {
+            'name': 'Visitor', 'email': 'visitor@example.com', 'message': 'Hello from a cached page',
+            'csrfmiddlewaretoken': token,
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_invalidation_from_another_process_expires_pages(self):
+        self.client.get('/contact/')
+        self.assertEqual(self.client.get('/contact/')['X-Page-Cache'], 'HIT')
+        # e.g. archive_requests, or a request saved in another gunicorn worker
+        subprocess.run(
+            [sys.executable, 'manage.py', 'shell', '-c',
+             'from projects.page_cache import invalidate_page_cache; invalidate_page_cache()'],
+            cwd=settings.BASE_DIR, check=True, capture_output=True,
+        )
+        self.assertEqual(self.client.get('/contact/')['X-Page-Cache'], 'MISS')
+
+    def test_query_strings_are_not_cached(self):
+        response = self.client.get('/contact/?x=1')
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertEqual(self.client.get('/contact/')['X-Page-Cache'], 'MISS')
+
+
+class ExportTests(TestCase):
+    """CSV exports are safe to open in a spreadsheet"""
+
+    def test_formula_cells_are_quoted(self):
+        user = User.objects.create_user('exporter', password='pw-export-123')
+        WebsiteRequest.objects.create(
+            user=user, business_name='=HYPERLINK("http://evil.example","click")', email='client@example.com',
+            description='@SUM(1+1)',
+        )
+        header, row = csv.reader(iter_csv(WebsiteRequest.objects.all()))
+        record = dict(zip(header, row))
+        self.assertEqual(record['business_name'], '\'=HYPERLINK("http://evil.example","click")')
+        self.assertEqual(record['description'], "'@SUM(1+1)")
+        self.assertEqual(record['email'], 'client@example.com')
+
+    def test_invalid_since_date_is_a_command_error(self):
+        with self.assertRaises(CommandError):
+            call_command('export_requests', since='31/01/2025', stdout=io.StringIO(), stderr=io.StringIO())
+
+
+class ImportRequestsTests(TestCase):
+    """import_requests validates rows and resumes from its checkpoint"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['business_name', 'website_type', 'description', 'budget', 'email'])
+            for i in range(1, 5):
+                writer.writerow([f'Lead {i}', 'business', 'Imported lead', '', f'lead{i}@example.com'])
+            writer.writerow(['Bad lead', 'business', 'No email', '', 'not-an-email'])
+        self.addCleanup(os.remove, self.path)
+
+    def run_import(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('import_requests', self.path, '--batch-size', '2', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        stdout, stderr = self.run_import()
+        self.assertIn('Row 5 skipped', stderr)
+        self.assertIn('email', stderr)
+        self.assertIn('Imported 4 request(s), skipped 1 invalid row(s)', stdout)
+        self.assertEqual(WebsiteRequest.objects.count(), 4)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_resumes_after_checkpoint(self):
+        # A previous run committed rows 1-2 together with its checkpoint, then died
+        ImportCheckpoint.objects.create(name=os.path.abspath(self.path), source=os.path.abspath(self.path), row=2)
+        stdout, _ = self.run_import()
+        self.assertIn('Resuming after row 2', stdout)
+        self.assertEqual(
+            sorted(WebsiteRequest.objects.values_list('business_name', flat=True)), ['Lead 3', 'Lead 4'],
+        )
+
+    def test_checkpoint_of_another_file_is_refused(self):
+        ImportCheckpoint.objects.create(name='leads', source='/elsewhere/other.csv', row=2)
+        with self.assertRaisesMessage(CommandError, 'belongs to /elsewhere/other.csv'):
+            self.run_import('--checkpoint', 'leads')
+        self.assertEqual(WebsiteRequest.objects.count(), 0)
+
+
+class ArchiveRoundTripTests(TestCase):
+    """Archiving and restoring a request gives back the same rows"""
+
+    def test_restore_preserves_every_column(self):
+        user = User.objects.create_user('archived', password='pw-archive-123')
+        website_request = WebsiteRequest.objects.create(
+            user=user, business_name='Acme', email='client@example.com', description='Shop', budget='$1000',
+        )
+        sent = StatusUpdate.objects.create(request=website_request, old_status='new', new_status='in_progress', admin_message='Started')
+        StatusUpdate.objects.filter(pk=sent.pk).update(
+            notified=True, notified_at=timezone.now() - timedelta(days=80), notify_attempts=1, notify_hash='a' * 64,
+            created_at=timezone.now() - timedelta(days=80),
+        )
+        failed = StatusUpdate.objects.create(request=website_request, old_status='in_progress', new_status='completed')
+        StatusUpdate.objects.filter(pk=failed.pk).update(
+            notify_attempts=3, notify_after=timezone.now() + timedelta(hours=1), notify_error='SMTPDataError: rejected',
+            created_at=timezone.now() - timedelta(days=70),
+        )
+        WebsiteRequest.objects.filter(pk=website_request.pk).update(
+            status='completed', updated_at=timezone.now() - timedelta(days=60),
+        )
+        request_before = WebsiteRequest.objects.filter(pk=website_request.pk).values().get()
+        updates_before = list(StatusUpdate.objects.order_by('pk').values())
+
+        self.assertEqual(archive_batch(older_than_days=30, batch_size=10), 1)
+        self.assertFalse(WebsiteRequest.objects.exists())
+        self.assertEqual(ArchivedWebsiteRequest.objects.get().status_updates.count(), 2)
+
+        self.assertEqual(restore_archived_requests(ArchivedWebsiteRequest.objects.all()), 1)
+        self.assertFalse(ArchivedWebsiteRequest.objects.exists())
+        self.assertEqual(list(StatusUpdate.objects.order_by('pk').values()), updates_before)
+        self.assertEqual(WebsiteRequest.objects.filter(pk=website_request.pk).values().get(), request_before)
+
+
+class PurgeStaleDataTests(TestCase):
+    """Abandoned request drafts are removed without extending the session"""
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_draft_removal_keeps_expire_date(self):
+        store = SessionStore()
+        store['website_request_data'] = {'business_name': 'Draft'}
+        store['website_request_saved_at'] = (timezone.now() - timedelta(days=10)).isoformat()
+        store['keep'] = 'me'
+        store.create()
+        expire_date = Session.objects.get(pk=store.session_key).expire_date
+
+        call_command('purge_stale_data', sleep=0, stdout=io.StringIO())
+
+        session = Session.objects.get(pk=store.session_key)
+        self.assertEqual(session.expire_date, expire_date)
+        self.assertEqual(session.get_decoded(), {'keep': 'me'})
+        self.assertEqual(dict(SessionStore(session_key=store.session_key).load()), {'keep': 'me'})
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_session_written_during_purge_is_left_alone(self):
+        store = SessionStore()
+        store['website_request_data'] = {'business_name': 'Draft'}
+        store['website_request_saved_at'] = (timezone.now() - timedelta(days=10)).isoformat()
+        store.create()
+        get_decoded = Session.get_decoded
+
+        def read_then_user_writes(session):
+            data = get_decoded(session)
+            concurrent = SessionStore(session_key=store.session_key)
+            concurrent['cart'] = 'fresh'
+            concurrent.save()
+            return data
+
+        with mock.patch.object(Session, 'get_decoded', autospec=True, side_effect=read_then_user_writes):
+            out = io.StringIO()
+            call_command('purge_stale_data', sleep=0, stdout=out)
+
+        self.assertIn('fresh', Session.objects.get(pk=store.session_key).get_decoded().values())
+        self.assertEqual(SessionStore(session_key=store.session_key).load()['cart'], 'fresh')
+        self.assertRegex(out.getvalue(), r'Request drafts:\s+0 row')
+
+
+@override_settings(EMAIL_DISPATCH_MODE='thread')
+class EmailDispatcherBootTests(TransactionTestCase):
+    """A dispatcher started at boot sends work that no email in this process queued"""
+
+    def test_status_update_alone_is_delivered(self):
+        website_request = WebsiteRequest.objects.create(business_name='Acme', email='client@example.com')
+        update = StatusUpdate.objects.create(request=website_request, old_status='new', new_status='contacted')
+        StatusUpdate.objects.filter(pk=update.pk).update(created_at=timezone.now() - timedelta(minutes=10))
+
+        self.assertIsNotNone(start_dispatcher())
+        deadline = time.monotonic() + 10
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.05)
+        shutdown_dispatcher(timeout=5)
+
+        self.assertEqual([message.to for message in mail.outbox], [['client@example.com']])
+        update.refresh_from_db()
+        self.assertTrue(update.notified)
+
+
+class QueueEmailConcurrencyTests(TransactionTestCase):
+    """Identical emails queued at the same moment from different threads are stored once"""
+
+    def test_concurrent_duplicates_are_suppressed(self):
+        create = EmailOutbox.objects.create
+        start = threading.Barrier(4)
+        errors = []
+
+        def slow_create(**kwargs):
+            time.sleep(0.2)  # widen the gap between the duplicate check and the insert
+            return create(**kwargs)
+
+        def submit():
+            try:
+                start.wait(timeout=5)
+                queue_email('Thanks', 'We got your request', ['client@example.com'])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        with mock.patch.object(EmailOutbox.objects, 'create', side_effect=slow_create):
+            threads = [threading.Thread(target=submit) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=30)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+
+@override_settings(
+    ADMIN_EMAIL_DIGEST_ENABLED=True, ADMIN_EMAIL_DIGEST_WINDOW_MINUTES=60, ADMIN_EMAIL_DIGEST_IMMEDIATE_BUDGET=5000,
+)
+class AdminDigestTests(TestCase):
+    """Admin notifications are batched per window; big budgets skip the digest"""
+
+    def submit(self, business_name, budget=''):
+        send_website_request_email(business_name, 'client@example.com', 'Business', 'A website', budget=budget)
+
+    def test_submissions_in_window_become_one_digest(self):
+        self.submit('Acme')
+        send_contact_form_email('Visitor', 'visitor@example.com', 'Hello')
+        self.submit('Globex')
+        self.assertEqual(flush_admin_digest(), 0)  # window still open
+        AdminDigestEntry.objects.update(created_at=timezone.now() - timedelta(minutes=61))
+
+        self.assertEqual(flush_admin_digest(), 3)
+        digest = EmailOutbox.objects.get()
+        self.assertEqual(digest.template, 'admin_digest')
+        self.assertIn('2 new request(s), 1 message(s)', digest.subject)
+        self.assertIn('Acme', digest.body)
+        self.assertIn('Globex', digest.body)
+        self.assertEqual(flush_admin_digest(), 0)
+
+    def test_forced_flush_ignores_window(self):
+        self.submit('Acme')
+        self.assertEqual(flush_admin_digest(force=True), 1)
+        self.assertEqual(EmailOutbox.objects.get().template, 'admin_digest')
+        self.assertFalse(AdminDigestEntry.objects.filter(digested_at__isnull=True).exists())
+
+    def test_high_budget_is_sent_immediately(self):
+        self.submit('Big Co', budget='$4,000 - $6k')
+        self.assertFalse(AdminDigestEntry.objects.exists())
+        self.assertEqual(EmailOutbox.objects.get().template, 'website_request_admin')
+
+    def test_budget_parsing(self):
+        self.assertEqual(parse_budget('$500-$1,000'), 1000)
+        self.assertEqual(parse_budget('5k'), 5000)
+        self.assertIsNone(parse_budget('flexible'))
+
+
+class FullTextSearchTests(TestCase):
+    """Admin search is answered from the full-text index, best matches first"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bakery = WebsiteRequest.objects.create(
+            business_name='Sunrise Bakery', email='owner@sunrise.example', description='Bakery website with bakery menu',
+        )
+        cls.store = WebsiteRequest.objects.create(
+            business_name='Hardware Store', email='shop@hardware.example',
+            description='We sell tools and supplies to builders, farms, schools and the bakery down the road',
+        )
+        WebsiteRequest.objects.create(business_name='Gym', email='gym@example.com', description='Fitness classes')
+        cls.update = StatusUpdate.objects.create(request=cls.bakery, old_status='new', new_status='contacted', admin_message='Called the owner')
+
+    def search(self, model_admin, term, model):
+        request = RequestFactory().get('/admin/', {'q': term})
+        queryset, _ = model_admin(model, admin.site).get_search_results(request, model.objects.all(), term)
+        return queryset
+
+    def test_match_is_ranked_by_relevance(self):
+        results = self.search(WebsiteRequestAdmin, 'bak', WebsiteRequest)  # prefix of the stemmed "bakery"
+        self.assertIn('search_rank', results.query.annotations)
+        self.assertEqual(list(results), [self.bakery, self.store])
+
+    def test_related_model_is_searched(self):
+        results = self.search(StatusUpdateAdmin, 'sunrise', StatusUpdate)
+        self.assertEqual(list(results), [self.update])
+
+    def test_falls_back_to_like_without_fts(self):
+        with mock.patch('projects.search._sqlite_has_fts', return_value=False):
+            results = self.search(WebsiteRequestAdmin, 'bakery', WebsiteRequest)
+            self.assertNotIn('search_rank', results.query.annotations)
+            self.assertIn('LIKE', str(results.query))
+            self.assertEqual(set(results), {self.bakery, self.store})
+
+
+class StatusChangeTrackingTests(TestCase):
+    """Admin status edits are detected from the loaded values, without re-reading the row"""
+
+    def setUp(self):
+        WebsiteRequest.objects.create(business_name='Acme', email='client@example.com')
+        self.website_request = WebsiteRequest.objects.get()
+        self.model_admin = WebsiteRequestAdmin(WebsiteRequest, admin.site)
+        self.request = RequestFactory().post('/admin/')
+
+    def test_status_change_records_one_update_without_extra_select(self):
+        self.website_request.status = 'contacted'
+        self.website_request.admin_notes = 'Called the client'
+        self.assertTrue(self.website_request.has_field_changed('status'))
+        self.assertEqual(self.website_request.get_loaded_value('status'), 'new')
+
+        # SAVEPOINT, UPDATE request, INSERT status update, RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            self.model_admin.save_model(self.request, self.website_request, form=None, change=True)
+
+        update = StatusUpdate.objects.get()
+        self.assertEqual((update.old_status, update.new_status, update.admin_message), ('new', 'contacted', 'Called the client'))
+        self.assertFalse(self.website_request.has_field_changed('status'))
+
+    def test_save_without_status_change_records_nothing(self):
+        self.website_request.admin_notes = 'Just a note'
+        self.assertFalse(self.website_request.has_field_changed('status'))
+        with self.assertNumQueries(1):
+            self.model_admin.save_model(self.request, self.website_request, form=None, change=True)
+        self.assertFalse(StatusUpdate.objects.exists())
+
+
+@override_settings(REPLICA_DATABASES=['replica_1'], REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(TestCase):
+    """Read-only views read from a replica unless the user wrote recently"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def routed_read(self, request):
+        @read_from_replica
+        def view(request):
+            return self.router.db_for_read(WebsiteRequest)
+        return view(request)
+
+    def test_reads_in_marked_views_use_replica(self):
+        self.assertEqual(self.routed_read(RequestFactory().get('/dashboard/')), 'replica_1')
+        self.assertEqual(self.router.db_for_read(WebsiteRequest), 'default')  # outside the view
+        self.assertEqual(self.router.db_for_write(WebsiteRequest), 'default')
+
+    def test_write_pins_following_reads_to_primary(self):
+        response = PrimaryPinningMiddleware(lambda request: HttpResponse())(RequestFactory().post('/request-website/'))
+        self.assertEqual(response.cookies[PIN_COOKIE_NAME]['max-age'], 10)
+
+        # While the pin cookie lives (replicas may still lag), reads stay on the primary
+        factory = RequestFactory()
+        factory.cookies[PIN_COOKIE_NAME] = '1'
+        self.assertEqual(self.routed_read(factory.get('/dashboard/')), 'default')
+        self.assertEqual(self.routed_read(RequestFactory().post('/dashboard/')), 'default')
+
+    def test_only_replicas_are_excluded_from_migrations(self):
+        self.assertIs(self.router.allow_migrate('replica_1', 'projects'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'projects'))
+        self.assertIsNone(self.router.allow_migrate('sqlite_stress', 'projects'))
+
+
+class SessionStrategyTests(TestCase):
+    """Anonymous visitors get no server-side session; SESSION_STRATEGY is validated"""
+
+    def test_anonymous_pages_create_no_session(self):
+        for path in ('/', '/request-website/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    def load_settings(self, strategy):
+        with mock.patch.dict(os.environ, {'SESSION_STRATEGY': strategy}):
+            return runpy.run_path(str(settings.BASE_DIR / 'arka_backend' / 'settings.py'))
+
+    def test_each_strategy_selects_its_engine(self):
+        for strategy, engine in settings.SESSION_ENGINES.items():
+            with self.subTest(strategy=strategy):
+                self.assertEqual(self.load_settings(strategy)['SESSION_ENGINE'], engine)
+
+    def test_unknown_strategy_is_improperly_configured(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'SESSION_STRATEGY'):
+            self.load_settings('redis')
@@ -1,29 +1,38 @@
+import hashlib
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from .forms import WebsiteRequestForm, ContactForm
 from .models import WebsiteRequest
-from .services import send_website_request_email, send_website_request_confirmation, send_contact_form_email
+from .services import send_website_request_notifications, send_contact_form_email
+from .stats import get_request_stats
+from .db import retry_on_locked
+from .routers import read_from_replica
+from .page_cache import anonymous_page_cache
+from .metrics import summarize, to_prometheus
 
 
+@anonymous_page_cache
+@read_from_replica
 def landing(request):
     """Landing page for Arka"""
-    # Dynamic stats
-    total_projects = WebsiteRequest.objects.count()
-    active_projects = WebsiteRequest.objects.exclude(status='completed').count()
-    happy_clients = WebsiteRequest.objects.filter(status='completed').count()
-
-    context = {
-        'total_projects': total_projects,
-        'active_projects': active_projects,
-        'happy_clients': happy_clients,
-    }
+    # Dynamic stats (one cached aggregate query)
+    context = get_request_stats()
     return render(request, 'landing.html', context)
 
 
 @require_http_methods(["GET", "POST"])
+@anonymous_page_cache
 def request_website(request):
     """Handle website request submissions from public form"""
     
@@ -35,34 +44,18 @@ def request_website(request):
                 # Save with user
                 website_request = form.save(commit=False)
                 website_request.user = request.user
-                website_request.save()
+                retry_on_locked(website_request.save)()
                 
-                # Send email to admin (non-blocking)
-                try:
-                    user_info = f"{request.user.first_name} {request.user.last_name}".strip() or request.user.username
-                    send_website_request_email(
-                        business_name=website_request.business_name,
-                        email=website_request.email,
-                        website_type=website_request.get_website_type_display(),
-                        description=website_request.description,
-                        budget=website_request.budget,
-                        is_logged_in=True,
-                        user_info=user_info
-                    )
-                except Exception as e:
-                    print(f"Email sending error (non-blocking): {str(e)}")
-                
-                # Send confirmation email to client
-                try:
-                    send_website_request_confirmation(website_request.email, website_request.business_name)
-                except Exception as e:
-                    print(f"Confirmation email error (non-blocking): {str(e)}")
+                # Queue admin notification and client confirmation (delivered by the email worker)
+                send_website_request_notifications(website_request, request.user)
                 
                 messages.success(request, '✅ Your website request has been submitted! Check your dashboard to track progress.')
                 return redirect('dashboard')
             else:
                 # Store form data in session and redirect to login
                 request.session['website_request_data'] = form.cleaned_data
+                # Lets purge_stale_data drop drafts that were never completed
+                request.session['website_request_saved_at'] = timezone.now().isoformat()
                 return redirect('login')
         else:
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -72,24 +65,76 @@ def request_website(request):
     
     context = {
         'form': form,
-        'total_requests': WebsiteRequest.objects.count(),
+        'total_requests': get_request_stats()['total_projects'],
     }
     return render(request, 'request_website.html', context)
 
 
+def _dashboard_state(request):
+    """
+    Cheap summary of everything the dashboard shows, computed once per request
+
+    One aggregate over the user's requests and their status updates: the row
+    counts catch deletions, the newest timestamps catch edits and new updates.
+    """
+    if not hasattr(request, '_dashboard_state'):
+        request._dashboard_state = request.user.website_requests.aggregate(
+            request_count=Count('id', distinct=True),
+            update_count=Count('status_updates', distinct=True),
+            last_request_change=Max('updated_at'),
+            last_status_update=Max('status_updates__created_at'),
+        )
+    return request._dashboard_state
+
+
+def _has_pending_messages(request):
+    # Flash messages are rendered once, so a page carrying them is never "not modified"
+    return bool(len(messages.get_messages(request)))
+
+
+def dashboard_etag(request):
+    """ETag for the dashboard page (None disables the conditional response)"""
+    if _has_pending_messages(request):
+        return None
+    state = _dashboard_state(request)
+    page = request.GET.get('page', '1')
+    parts = [
+        request.user.pk, page, settings.DASHBOARD_PAGE_SIZE,
+        state['request_count'], state['update_count'],
+        state['last_request_change'], state['last_status_update'],
+    ]
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def dashboard_last_modified(request):
+    """Last-Modified for the dashboard page: newest request edit or status update"""
+    if _has_pending_messages(request):
+        return None
+    state = _dashboard_state(request)
+    timestamps = [t for t in (state['last_request_change'], state['last_status_update']) if t]
+    return max(timestamps) if timestamps else None
+
+
 @login_required(login_url='login')
+@read_from_replica
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=dashboard_etag, last_modified_func=dashboard_last_modified)
 def dashboard(request):
-    """Show user's submitted website requests"""
-    requests = request.user.website_requests.all()
+    """Show user's submitted website requests (paginated, status timeline prefetched)"""
+    requests = request.user.website_requests.prefetch_related('status_updates')
+    paginator = Paginator(requests, settings.DASHBOARD_PAGE_SIZE)
+    page_obj = paginator.get_page(request.GET.get('page'))
     
     context = {
-        'requests': requests,
-        'total_requests': requests.count(),
+        'requests': list(page_obj),
+        'page_obj': page_obj,
+        'total_requests': paginator.count,
     }
     return render(request, 'dashboard.html', context)
 
 
 @require_http_methods(["GET", "POST"])
+@anonymous_page_cache
 def contact(request):
     """Handle contact form submissions"""
     
@@ -141,31 +186,14 @@ def login_view(request):
             # Check if there's pending form data
             if 'website_request_data' in request.session:
                 data = request.session.pop('website_request_data')
-                website_request = WebsiteRequest.objects.create(
+                request.session.pop('website_request_saved_at', None)
+                website_request = retry_on_locked(WebsiteRequest.objects.create)(
                     user=user,
                     **data
                 )
                 
-                # Send email to admin (non-blocking)
-                try:
-                    user_info = f"{user.first_name} {user.last_name}".strip() or user.username
-                    send_website_request_email(
-                        business_name=website_request.business_name,
-                        email=website_request.email,
-                        website_type=website_request.get_website_type_display(),
-                        description=website_request.description,
-                        budget=website_request.budget,
-                        is_logged_in=True,
-                        user_info=user_info
-                    )
-                except Exception as e:
-                    print(f"Email sending error (non-blocking): {str(e)}")
-                
-                # Send confirmation email to client
-                try:
-                    send_website_request_confirmation(website_request.email, website_request.business_name)
-                except Exception as e:
-                    print(f"Confirmation email error (non-blocking): {str(e)}")
+                # Queue admin notification and client confirmation (delivered by the email worker)
+                send_website_request_notifications(website_request, user)
                 
                 messages.success(request, '✅ Welcome back! Your website request has been saved.')
                 return redirect('dashboard')
@@ -226,31 +254,14 @@ def signup_view(request):
         # Check if there's pending form data
         if 'website_request_data' in request.session:
             data = request.session.pop('website_request_data')
-            website_request = WebsiteRequest.objects.create(
+            request.session.pop('website_request_saved_at', None)
+            website_request = retry_on_locked(WebsiteRequest.objects.create)(
                 user=user,
                 **data
             )
             
-            # Send email to admin (non-blocking)
-            try:
-                user_info = f"{user.first_name} {user.last_name}".strip() or user.username
-                send_website_request_email(
-                    business_name=website_request.business_name,
-                    email=website_request.email,
-                    website_type=website_request.get_website_type_display(),
-                    description=website_request.description,
-                    budget=website_request.budget,
-                    is_logged_in=True,
-                    user_info=user_info
-                )
-            except Exception as e:
-                print(f"Email sending error (non-blocking): {str(e)}")
-            
-            # Send confirmation email to client
-            try:
-                send_website_request_confirmation(website_request.email, website_request.business_name)
-            except Exception as e:
-                print(f"Confirmation email error (non-blocking): {str(e)}")
+            # Queue admin notification and client confirmation (delivered by the email worker)
+            send_website_request_notifications(website_request, user)
             
             messages.success(request, '✅ Account created! Your website request has been saved.')
             return redirect('dashboard')
@@ -271,3 +282,16 @@ def logout_view(request):
     logout(request)
     messages.success(request, '✅ You have been logged out.')
     return redirect('request-website')
+
+
+@staff_member_required
+def email_metrics(request):
+    """Email send metrics for staff: JSON by default, ?format=prometheus for scraping"""
+    try:
+        minutes = max(1, int(request.GET.get('minutes', 60)))
+    except ValueError:
+        return JsonResponse({'error': 'minutes must be a number.'}, status=400)
+    summary = summarize(since_minutes=minutes)
+    if request.GET.get('format') == 'prometheus':
+        return HttpResponse(to_prometheus(summary), content_type='text/plain; version=0.0.4')
+    return JsonResponse(summary)
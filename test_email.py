@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 """
 Test script for email functionality
+Queues the contact, admin and confirmation emails in a throwaway test database,
+then delivers them the way the email worker does (claim_outbox_emails +
+deliver_outbox_email) to an in-process SMTP sink, so nothing reaches a real mailbox.
 Run with: python test_email.py
 """
 
@@ -10,56 +13,100 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'arka_backend.settings')
 django.setup()
 
-from projects.services import send_contact_form_email, send_website_request_email, send_website_request_confirmation
+from django.db import connection
+from django.test import override_settings
+from projects.services import (
+    claim_outbox_emails, deliver_outbox_email, send_contact_form_email, send_website_request_email,
+    send_website_request_confirmation,
+)
+from projects.smtp_pool import reset_pool
+from projects.smtp_sink import SMTPSinkServer
 
-print("=" * 60)
-print("TESTING ARKA EMAIL FUNCTIONALITY")
-print("=" * 60)
+sink = SMTPSinkServer()
+sink.start()
+email_settings = override_settings(
+    EMAIL_BACKEND='projects.mail.InstrumentedSMTPBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_PORT=sink.port,
+    EMAIL_USE_TLS=False,
+    EMAIL_USE_SSL=False,
+    EMAIL_HOST_USER='test',
+    EMAIL_HOST_PASSWORD='test',
+    DEFAULT_FROM_EMAIL='noreply@example.com',
+    ADMIN_EMAIL='admin@example.com',
+    ADMIN_EMAIL_DIGEST_ENABLED=False,
+    EMAIL_DISPATCH_MODE='worker',  # delivered below, not by a background dispatcher
+)
+email_settings.enable()
+reset_pool()
+old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
 
-# Test 1: Contact form email
-print("\n[TEST 1] Contact Form Email")
-print("-" * 60)
 try:
-    result = send_contact_form_email(
-        name="Test User",
-        email="test@example.com",
-        message="This is a test message from the contact form. Please verify it was received correctly."
-    )
-    print(f"✓ Contact email sent: {result}")
-except Exception as e:
-    print(f"✗ Error sending contact email: {str(e)}")
+    print("=" * 60)
+    print("TESTING ARKA EMAIL FUNCTIONALITY")
+    print("=" * 60)
+    print(f"SMTP sink listening on 127.0.0.1:{sink.port}")
 
-# Test 2: Website request email
-print("\n[TEST 2] Website Request Email (Admin Notification)")
-print("-" * 60)
-try:
-    result = send_website_request_email(
-        business_name="Test Business",
-        email="client@example.com",
-        website_type="E-Commerce Store",
-        description="We need a beautiful e-commerce website to sell our products online. The website should have product catalog, shopping cart, and payment integration.",
-        budget="$1000 - $2000",
-        is_logged_in=True,
-        user_info="John Doe"
-    )
-    print(f"✓ Website request email sent to admin: {result}")
-except Exception as e:
-    print(f"✗ Error sending website request email: {str(e)}")
+    # Test 1: Contact form email
+    print("\n[TEST 1] Contact Form Email")
+    print("-" * 60)
+    try:
+        result = send_contact_form_email(
+            name="Test User",
+            email="test@example.com",
+            message="This is a test message from the contact form. Please verify it was received correctly."
+        )
+        print(f"✓ Contact email queued: {result}")
+    except Exception as e:
+        print(f"✗ Error queueing contact email: {str(e)}")
 
-# Test 3: Confirmation email
-print("\n[TEST 3] Website Request Confirmation Email (Client)")
-print("-" * 60)
-try:
-    result = send_website_request_confirmation(
-        email="client@example.com",
-        business_name="Test Business"
-    )
-    print(f"✓ Confirmation email sent to client: {result}")
-except Exception as e:
-    print(f"✗ Error sending confirmation email: {str(e)}")
+    # Test 2: Website request email
+    print("\n[TEST 2] Website Request Email (Admin Notification)")
+    print("-" * 60)
+    try:
+        result = send_website_request_email(
+            business_name="Test Business",
+            email="client@example.com",
+            website_type="E-Commerce Store",
+            description="We need a beautiful e-commerce website to sell our products online. The website should have product catalog, shopping cart, and payment integration.",
+            budget="$1000 - $2000",
+            is_logged_in=True,
+            user_info="John Doe"
+        )
+        print(f"✓ Website request email queued for admin: {result}")
+    except Exception as e:
+        print(f"✗ Error queueing website request email: {str(e)}")
+
+    # Test 3: Confirmation email
+    print("\n[TEST 3] Website Request Confirmation Email (Client)")
+    print("-" * 60)
+    try:
+        result = send_website_request_confirmation(
+            email="client@example.com",
+            business_name="Test Business"
+        )
+        print(f"✓ Confirmation email queued for client: {result}")
+    except Exception as e:
+        print(f"✗ Error queueing confirmation email: {str(e)}")
+
+    # Deliver what was queued
+    print("\n[DELIVERY] Outbox -> SMTP sink")
+    print("-" * 60)
+    sent = failed = 0
+    for outbox_email in claim_outbox_emails():
+        if deliver_outbox_email(outbox_email):
+            sent += 1
+            print(f"✓ Sent to {', '.join(outbox_email.recipients)}: {outbox_email.subject}")
+        else:
+            failed += 1
+            print(f"✗ Failed for {', '.join(outbox_email.recipients)}: {outbox_email.last_error}")
 
-print("\n" + "=" * 60)
-print("EMAIL TESTING COMPLETED")
-print("=" * 60)
-print("\nNote: Check your console output above for emails if DEBUG=True")
-print("For production, check your Gmail inbox at rajumang74@gmail.com")
+    print("\n" + "=" * 60)
+    print("EMAIL TESTING COMPLETED")
+    print("=" * 60)
+    print(f"\n{sent} sent, {failed} failed; the sink accepted {sink.stats['messages']} message(s)")
+finally:
+    reset_pool()
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+    email_settings.disable()
+    sink.stop()